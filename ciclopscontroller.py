@@ -6,31 +6,51 @@ from PySide6.QtCore import QTimer, QThread
 from ciclopscontroller.controllers.satcontroller import SatController
 from ciclopscontroller.controllers.mountcontroller import MountController
 from ciclopscontroller.controllers.timecontroller import TimeController
+from ciclopscontroller.drivers.simulatedmount import SimulatedMount
+from ciclopscontroller.drivers.ascommount import AscomMount
+from ciclopscontroller.drivers.lx200mount import LX200Mount, DEFAULT_PORT
+
+import argparse
 
 import signal
 import atexit
 
 if __name__ == "__main__":
     # pg.setConfigOption(antialias=True)
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mount", choices=["simulated", "ascom", "lx200"], default="simulated")
+    parser.add_argument("--mount-host", help="10Micron address for --mount lx200, host[:port]")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    mount_latency = 0.0  # Mount-side reaction time the link cannot measure, unknown for real hardware
+    if args.mount == "lx200":
+        if not args.mount_host:
+            parser.error("--mount lx200 needs --mount-host")
+        host, _, port = args.mount_host.partition(":")
+        mount_driver = LX200Mount(host, int(port or DEFAULT_PORT))
+    elif args.mount == "ascom":
+        mount_driver = AscomMount()
+    else:
+        mount_driver = SimulatedMount()
+        mount_latency = mount_driver.command_latency
 
-    time_controller = TimeController()
-    time_controller_thread = QThread()
-    time_controller.moveToThread(time_controller_thread)
+    time_controller = TimeController()  # Lock-free for readers, needs no thread of its own
 
     sat_controller = SatController(time_controller)
     sat_controller_thread = QThread()
     sat_controller.moveToThread(sat_controller_thread)
 
-    mount_controller = MountController(time_controller, sat_controller) 
+    mount_controller = MountController(time_controller, sat_controller, mount_driver, mount_latency=mount_latency)
     mount_controller_thread = QThread()
     mount_controller.moveToThread(mount_controller_thread)
 
-    time_controller_thread.start()
+    sat_controller_thread.started.connect(sat_controller.initialize_timer)
+    mount_controller_thread.started.connect(mount_controller.initialize_timer)
+
     sat_controller_thread.start()
     mount_controller_thread.start()
-
-    time_controller.initialize_timer()
+    mount_controller.mount_worker_thread.start()
 
     window = MainWindow(time_controller, mount_controller, sat_controller)
     window.show()
@@ -40,9 +60,14 @@ if __name__ == "__main__":
         app.quit()
     
     def cleanup():
-        time_controller_thread.quit()
-        sat_controller_thread.quit()
-        mount_controller_thread.quit()
+        # Stop every thread's timers on that thread and leave the mount stopped before the threads go.
+        # The tracking loop goes first so it sends no rates after the worker has stopped the mount
+        mount_controller.shutdown_requested.emit()
+        mount_controller.mount_worker.shutdown_requested.emit()
+        sat_controller.shutdown_requested.emit()
+        for thread in (mount_controller_thread, mount_controller.mount_worker_thread, sat_controller_thread):
+            thread.quit()
+            thread.wait()
 
     atexit.register(cleanup)
     signal.signal(signal.SIGINT, signal_handler)
@@ -1,11 +1,210 @@
-from PySide6.QtCore import QObject
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+from PySide6.QtCore import QObject, QThread, QTimer, Qt, Signal, Slot
 
 from ciclopscontroller.controllers.timecontroller import TimeController
 from ciclopscontroller.controllers.satcontroller import SatController
+from ciclopscontroller.controllers.mountworker import MountWorker
+from ciclopscontroller.controllers.profiler import PROFILER, LatencyProbe
+from ciclopscontroller.drivers.mountdriver import MountDriver
+from ciclopscontroller.drivers.simulatedmount import SimulatedMount
+from ciclopscontroller.ephemeris.frames import PositionFrame
+
+INTEGRAL_ZONE = 0.1  # Degrees, the integral only accumulates once the error is this small, not while acquiring
+
+
+class TrackingStatus(NamedTuple):
+    azimuth_error: float    # Degrees, target minus predicted mount position, when the command lands
+    elevation_error: float  # Degrees
+    latency: float          # Seconds the target was predicted ahead by
+    interval: float         # Mean seconds between loop iterations over the jitter window
+    jitter: float           # 99th percentile of |interval - loop_interval|, in seconds
+
 
 class MountController(QObject):
-    def __init__(self, time_controller: TimeController, sat_controller: SatController):
+    tracking_requested = Signal(bool)
+    tracking_status = Signal(object)  # TrackingStatus, about twice a second while tracking
+    shutdown_requested = Signal()  # Blocks the emitting thread until the tracking loop has stopped
+
+    def __init__(self, time_controller: TimeController, sat_controller: SatController, driver: MountDriver = None,
+                 loop_interval=50, kp=2.0, ki=0.2, kd=0.0, max_rate=5.0, mount_latency=0.0):
+        """
+        ==============  ==================================================================================
+        **Arguments:**
+        driver          MountDriver, SimulatedMount if None. Pass e.g. an AscomMount or LX200Mount for hardware
+        loop_interval   Milliseconds between tracking loop iterations
+        kp, ki, kd      PID gains on the position error in degrees, giving a correction in deg/s
+        max_rate        Commanded rates are clipped to +-max_rate deg/s
+        mount_latency   Seconds the mount takes to act on a command once received, which the link cannot
+                        measure. Added to the worker's measured command latency
+        ==============  ==================================================================================
+
+        The driver is owned by a MountWorker on its own thread, start it with ``mount_worker_thread.start()``.
+        Everything here only hands requests to the worker or reads its samples, so none of it blocks on
+        the mount link. Run initialize_timer() on this controller's own thread once it starts.
+
+        While tracking, a fixed-rate loop on this controller's thread commands the satellite's az/el rates as
+        feed-forward plus a PID correction. A command only takes effect one latency later, so both the target
+        and the mount position are predicted to that moment: the target by evaluating the satellite there,
+        the mount by extrapolating its last sample at the rates it was last sent.
+
+        The loop runs on the driver's clock(), the same clock its position timestamps come from. For real
+        hardware that is perf_counter(). For reproducible runs on a stepped TimeController, give the
+        SimulatedMount the simulation clock, leave both threads unstarted and call track_step() after every
+        advance() instead of starting tracking.
+        """
         super().__init__()
         self.time_controller = time_controller
         self.sat_controller = sat_controller
+        self.loop_interval = loop_interval
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.max_rate = max_rate
+        self.mount_latency = mount_latency
+
+        self.mount_worker = MountWorker(driver or SimulatedMount())
+        self.mount_worker_thread = QThread()
+        self.mount_worker.moveToThread(self.mount_worker_thread)
+        self.mount_worker_thread.started.connect(self.mount_worker.initialize_timer)
+
+        self.tracking = False
+        self._tracking_timer = None
+        self._latency_probe = None
+        self._intervals = deque(maxlen=200)
+        self._last_iteration = None
+        self._last_error = None
+        self._integral = np.zeros(2)
+        self._status_countdown = 0
+
+        self.tracking_requested.connect(self._set_tracking)
+        self.shutdown_requested.connect(self._shutdown, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def set_driver(self, driver: MountDriver):
+        self.mount_worker.driver_requested.emit(driver)
+
+    def get_position(self):
+        """Latest MountPosition, or None before the mount has been read."""
+        return self.mount_worker.latest()
+
+    def move_axes(self, azimuth_rate, elevation_rate):
+        self.mount_worker.set_rates(azimuth_rate, elevation_rate)
+
+    @Slot(float, float)
+    def slew_to_altaz(self, azimuth, elevation):
+        self.tracking_requested.emit(False)
+        self.mount_worker.slew_requested.emit(azimuth, elevation)
+
+    @Slot()
+    def abort(self):
+        self.tracking_requested.emit(False)
+        self.mount_worker.abort_requested.emit()
+
+    def start_tracking(self):
+        self.tracking_requested.emit(True)
+
+    def stop_tracking(self):
+        self.tracking_requested.emit(False)
+
+    @Slot(bool)
+    def _set_tracking(self, tracking):
+        # Runs on this controller's thread, so the loop timer lives there and not on the GUI thread
+        if self._tracking_timer is None:
+            self._tracking_timer = QTimer()
+            self._tracking_timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self._tracking_timer.timeout.connect(self.track)
+        if tracking == self.tracking:
+            return
+        self.tracking = tracking
+        if tracking:
+            self._intervals.clear()
+            self._last_iteration = None
+            self._last_error = None
+            self._integral[:] = 0
+            self._tracking_timer.start(self.loop_interval)
+        else:
+            self._tracking_timer.stop()
+            self.mount_worker.set_rates(0.0, 0.0)
+
+    @Slot()
+    def initialize_timer(self):
+        # Must run on this controller's thread, the tracking loop's event loop is the one worth probing
+        if self._latency_probe is None:
+            self._latency_probe = LatencyProbe('tracking')  # Idle until profiling
+
+    @Slot()
+    def _shutdown(self):
+        # Timers can only be stopped from their own thread, the mount itself is stopped by the worker
+        self.tracking = False
+        if self._tracking_timer is not None:
+            self._tracking_timer.stop()
+        if self._latency_probe is not None:
+            self._latency_probe.stop()
+
+    def track_step(self):
+        """One loop iteration on the calling thread: read the mount, compute and send the rates. For stepped runs."""
+        if not self.mount_worker.ensure_connected():
+            return
+        self.mount_worker.poll()
+        self.track()
+        self.mount_worker.send_rates()
+
+    def _simulation_time(self, state, now):
+        """Simulation time at driver clock time ``now``, and simulation seconds per driver clock second."""
+        if state.step is not None:
+            # Stepped runs only make sense with the driver on the simulation clock itself
+            return now, 1.0
+        if not state.running:
+            return state.reference_time, 0.0
+        # Real time, the driver's clock is perf_counter() like the ClockState reference
+        return state.reference_time + (now - state.reference_counter) * state.speed, state.speed
+
+    def loop_jitter(self):
+        """(mean interval, p99 |interval - loop_interval|) in seconds over the recent iterations."""
+        if not self._intervals:
+            return 0.0, 0.0
+        intervals = np.array(self._intervals)
+        return intervals.mean(), np.percentile(np.abs(intervals - self.loop_interval / 1000), 99)
+
+    @Slot()
+    def track(self):
+        now = self.mount_worker.driver.clock()
+        dt = None if self._last_iteration is None else now - self._last_iteration
+        self._last_iteration = now
+        if dt is not None:
+            self._intervals.append(dt)
+
+        sample = self.mount_worker.latest()
+        if sample is None or self.sat_controller.satellite is None:
+            return
+        with PROFILER.stage('tracking loop'):
+            latency = self.mount_worker.command_latency + self.mount_latency
+            arrival = now + latency
+
+            state = self.time_controller.get_state()
+            time_since_epoch, speed = self._simulation_time(state, arrival)
+            (alt, az), = self.sat_controller.get_sat_positions([time_since_epoch], PositionFrame.ALTAZ)
+            (alt_rate, az_rate, _), = self.sat_controller.get_sat_positions([time_since_epoch], PositionFrame.ALTAZ_RATE)
+            target = np.rad2deg([az, alt])
+            feed_forward = np.rad2deg([az_rate, alt_rate]) * speed  # Per simulated second to per driver clock second
+
+            mount = np.array([sample.azimuth, sample.elevation])
+            predicted = mount + np.array(self.mount_worker.sent_rates) * (arrival - sample.timestamp)
+            error = target - predicted
+            error[0] = (error[0] + 180) % 360 - 180  # Shortest way round in azimuth
+
+            derivative = np.zeros(2) if self._last_error is None or not dt else (error - self._last_error) / dt
+            self._last_error = error
+            rates = feed_forward + self.kp * error + self.ki * self._integral + self.kd * derivative
+            if dt:
+                # Conditional integration, no windup while acquiring or with an axis at its rate limit
+                integrate = (np.abs(error) < INTEGRAL_ZONE) & (np.abs(rates) <= self.max_rate)
+                self._integral += np.where(integrate, error * dt, 0)
+            rates = np.clip(rates, -self.max_rate, self.max_rate)
+            self.mount_worker.set_rates(float(rates[0]), float(rates[1]))
 
+        self._status_countdown -= 1
+        if self._status_countdown <= 0:
+            self._status_countdown = max(1, 500 // self.loop_interval)
+            interval, jitter = self.loop_jitter()
+            self.tracking_status.emit(TrackingStatus(float(error[0]), float(error[1]), latency, interval, jitter))
@@ -0,0 +1,191 @@
+from collections import deque
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
+
+from ciclopscontroller.controllers.profiler import PROFILER, LatencyProbe
+from ciclopscontroller.drivers.mountdriver import MountDriver, MountAxis
+
+LATENCY_SMOOTHING = 0.1  # EMA weight of each new command latency measurement
+
+
+class MountWorker(QObject):
+    rates_requested = Signal()
+    slew_requested = Signal(float, float)
+    abort_requested = Signal()
+    driver_requested = Signal(object)
+    error_occurred = Signal(str)
+    shutdown_requested = Signal()  # Blocks the emitting thread until the mount is stopped and disconnected
+
+    def __init__(self, driver: MountDriver, poll_interval=20, rate_threshold=1e-4, max_samples=1000):
+        """
+        ==============  ==================================================================================
+        **Arguments:**
+        driver          MountDriver the worker owns, only ever touched from the worker thread
+        poll_interval   Milliseconds between position reads
+        rate_threshold  Rate changes smaller than this (deg/s) are not sent to the mount
+        max_samples     Number of most recent position samples kept in ``samples``
+        ==============  ==================================================================================
+
+        Does all mount I/O on its own thread so a stalled link never blocks the GUI or the tracking loop.
+        Positions are appended to ``samples`` (a deque, appends and reads of [-1] are atomic, so readers
+        take no lock). Rate commands are latest-value-wins: set_rates() only stores the request, rates and
+        timestamp together in a one-slot deque so the worker always takes a matching pair, at most one send
+        is queued at a time and it sends whatever the latest request is by then, so superseded MoveAxis
+        commands are never sent.
+        """
+        super().__init__()
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.rate_threshold = rate_threshold
+        self.samples = deque(maxlen=max_samples)
+
+        self.commands_sent = 0
+        self.commands_skipped = 0  # Superseded before being sent, or below rate_threshold
+        self.command_latency = 0.0  # Seconds of driver.clock() from set_rates() to the mount taking the command, smoothed
+        self.sent_rates = (0.0, 0.0)  # Rates the axes were last told to move at, deg/s
+        self._requests = deque(maxlen=1)  # (azimuth rate, elevation rate, driver.clock() when requested)
+        self._send_queued = False
+        self._poll_timer = None
+        self._latency_probe = None
+
+        self.rates_requested.connect(self.send_rates)
+        self.slew_requested.connect(self._slew_to_altaz)
+        self.abort_requested.connect(self._abort)
+        self.driver_requested.connect(self._set_driver)
+        self.shutdown_requested.connect(self._shutdown, Qt.ConnectionType.BlockingQueuedConnection)
+
+    @Slot()
+    def initialize_timer(self):
+        # Must run on the worker thread, the driver is connected and polled from there
+        PROFILER.name_thread('mount')
+        if self._poll_timer is None:
+            self._poll_timer = QTimer()
+            self._poll_timer.timeout.connect(self.poll)
+            self._poll_timer.start(self.poll_interval)
+        if self._latency_probe is None:
+            self._latency_probe = LatencyProbe('mount')  # Created here to live on this thread, idle until profiling
+        self.ensure_connected()
+
+    def latest(self):
+        """Most recent MountPosition, or None before the first read. Safe from any thread."""
+        try:
+            return self.samples[-1]
+        except IndexError:
+            return None
+
+    def set_rates(self, azimuth_rate, elevation_rate):
+        """Request axis rates in deg/s from any thread, replacing any request not yet sent."""
+        if self._requests:
+            self.commands_skipped += 1
+        self._requests.append((azimuth_rate, elevation_rate, self.driver.clock()))  # Replaces any unsent request
+        if not self._send_queued:
+            self._send_queued = True
+            self.rates_requested.emit()
+
+    @Slot()
+    def poll(self):
+        # No reconnecting here, that could mean a chooser dialog every poll. Commands retry the connection.
+        if not self.driver.connected:
+            return
+        with PROFILER.stage('mount poll'):
+            try:
+                self.samples.append(self.driver.read_position())
+            except (OSError, ValueError) as e:
+                self._report(e)
+
+    @Slot()
+    def send_rates(self):
+        """Send the latest rate request, if any. Normally queued by set_rates(), call directly in stepped runs."""
+        self._send_queued = False
+        try:
+            *rates, request_time = self._requests.popleft()
+        except IndexError:
+            return
+        if not self.ensure_connected():
+            return
+        with PROFILER.stage('mount command'):
+            for axis, rate in zip(MountAxis, rates):
+                sent_rates = list(self.sent_rates)
+                sent = sent_rates[axis.value]
+                # Stopping an axis is never skipped, however small the change
+                if abs(rate - sent) < self.rate_threshold and not (rate == 0 and sent != 0):
+                    self.commands_skipped += 1
+                    continue
+                try:
+                    self.driver.move_axis(axis, rate)
+                except (OSError, ValueError) as e:
+                    self._report(e)
+                    return
+                # Recorded per axis, so an error on the next axis never leaves this one moving at an unknown rate
+                sent_rates[axis.value] = rate
+                self.sent_rates = tuple(sent_rates)
+                self.commands_sent += 1
+        latency = self.driver.clock() - request_time
+        self.command_latency += LATENCY_SMOOTHING * (latency - self.command_latency)
+
+    @Slot(float, float)
+    def _slew_to_altaz(self, azimuth, elevation):
+        self._requests.clear()
+        if not self.ensure_connected():
+            return
+        try:
+            self.driver.slew_to_altaz(azimuth, elevation)
+        except (OSError, ValueError) as e:
+            self._report(e)
+        self.sent_rates = (0.0, 0.0)
+
+    @Slot()
+    def _abort(self):
+        self._requests.clear()
+        if not self.driver.connected:
+            return
+        try:
+            self.driver.abort()
+        except (OSError, ValueError) as e:
+            self._report(e)
+        self.sent_rates = (0.0, 0.0)
+
+    @Slot(object)
+    def _set_driver(self, driver):
+        self._abort()
+        if self.driver.connected:
+            self.driver.disconnect()
+        self.driver = driver
+        self.samples.clear()
+        self.ensure_connected()
+
+    @Slot()
+    def _shutdown(self):
+        # Leave the mount stopped, never slewing or still moving at the last tracking rates
+        if self._poll_timer is not None:
+            self._poll_timer.stop()
+        if self._latency_probe is not None:
+            self._latency_probe.stop()
+        self._requests.clear()
+        if not self.driver.connected:
+            return
+        try:
+            for axis in MountAxis:
+                self.driver.move_axis(axis, 0.0)
+        except (OSError, ValueError) as e:
+            self._report(e)
+        self._abort()
+        try:
+            self.driver.disconnect()
+        except (OSError, ValueError) as e:
+            self._report(e)
+
+    def ensure_connected(self):
+        if self.driver.connected:
+            return True
+        try:
+            self.driver.connect()
+        except (OSError, ValueError) as e:
+            self._report(e)
+            return False
+        self.sent_rates = (0.0, 0.0)
+        return True
+
+    def _report(self, error):
+        print(f"Mount I/O error: {error}")
+        self.error_occurred.emit(str(error))
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
+
+
+class Profiler:
+    def __init__(self, max_events=100000, window=500):
+        """
+        ==============  =======================================================================================
+        **Arguments:**
+        max_events      Number of most recent events kept for the Chrome trace export
+        window          Number of most recent durations per stage the percentiles are computed over
+        ==============  =======================================================================================
+
+        Collects timed stages from any thread. Disabled by default, stage() then returns a shared no-op
+        context so instrumented code costs one attribute check. Appending to a deque is atomic, so
+        recording takes no lock.
+        """
+        self.enabled = False
+        self.window = window
+        self._origin = perf_counter()
+        self._events = deque(maxlen=max_events)
+        self._durations = {}
+        self._thread_names = {}
+        self._noop = nullcontext()
+        self.probes = []  # LatencyProbes, started and stopped together with the profiler by its overlay
+
+    def stage(self, name):
+        """Context manager timing the enclosed block as ``name`` on the calling thread."""
+        if not self.enabled:
+            return self._noop
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, perf_counter())
+
+    def record(self, name, start, end):
+        """Record a stage measured elsewhere, ``start`` and ``end`` are perf_counter() values."""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        self._events.append((name, thread.ident, start, end))
+        durations = self._durations.get(name)
+        if durations is None:
+            durations = self._durations.setdefault(name, deque(maxlen=self.window))
+        durations.append(end - start)
+
+    def name_thread(self, name):
+        """Label the calling thread in exported traces, QThreads otherwise show up as Dummy-N."""
+        self._thread_names[threading.get_ident()] = name
+
+    def clear(self):
+        self._events.clear()
+        self._durations = {}
+
+    def summary(self):
+        """Return ``{stage: (count, p50_ms, p99_ms)}`` over each stage's rolling window."""
+        result = {}
+        for name, durations in list(self._durations.items()):
+            values = np.array(durations) * 1000
+            if len(values):
+                result[name] = (len(values), np.percentile(values, 50), np.percentile(values, 99))
+        return result
+
+    def export_chrome_trace(self, filename):
+        """Write the recorded events as Chrome trace JSON, open it in chrome://tracing or Perfetto."""
+        pid = os.getpid()
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        events += [
+            {
+                'name': name, 'cat': 'ciclops', 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': (start - self._origin) * 1e6, 'dur': (end - start) * 1e6
+            }
+            for name, tid, start, end in list(self._events)
+        ]
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+# Shared by every thread, like the timescale in ephemeris.loader
+PROFILER = Profiler()
+
+
+class LatencyProbe(QObject):
+    start_requested = Signal()
+    stop_requested = Signal()
+
+    def __init__(self, thread_name, interval=100):
+        """
+        Measures how late a ``interval`` ms timer fires on the thread the probe lives on and records it as
+        stage ``event loop latency (thread_name)``. A busy event loop shows up as large lateness. Create it
+        on the probed thread. It stays idle, waking nothing, until start_requested is emitted (from any
+        thread, the profiler overlay does this for every probe in PROFILER.probes).
+        """
+        super().__init__()
+        PROFILER.probes.append(self)
+        self.start_requested.connect(self.start)
+        self.stop_requested.connect(self.stop)
+        self.thread_name = thread_name
+        self.name = f'event loop latency ({thread_name})'
+        self.interval = interval
+        self._timer = None
+        self._expected = 0.0
+
+    @Slot()
+    def start(self):
+        PROFILER.name_thread(self.thread_name)
+        if self._timer is None:
+            self._timer = QTimer(timerType=Qt.TimerType.PreciseTimer)
+            self._timer.timeout.connect(self._tick)
+        self._expected = perf_counter() + self.interval / 1000
+        self._timer.start(self.interval)
+
+    @Slot()
+    def stop(self):
+        if self._timer is not None:
+            self._timer.stop()
+
+    @Slot()
+    def _tick(self):
+        now = perf_counter()
+        # Recorded as an event spanning the delay, so it lines up with whatever blocked the loop
+        PROFILER.record(self.name, self._expected, max(now, self._expected))
+        self._expected = now + self.interval / 1000
@@ -1,109 +1,292 @@
 from ciclopscontroller.controllers.timecontroller import TimeController
-from PySide6.QtCore import QObject
+from ciclopscontroller.controllers.profiler import PROFILER, LatencyProbe
+from ciclopscontroller.ephemeris.catalog import Catalog
+from ciclopscontroller.ephemeris.ephemeriscache import EphemerisCache
+from ciclopscontroller.ephemeris.chebyshev import ChebyshevEphemeris
+from ciclopscontroller.ephemeris.diskcache import DiskCache, tle_lines
+from ciclopscontroller.ephemeris.passes import PassPredictor
+from ciclopscontroller.ephemeris.visibility import VisibilityFilter, HorizonMask
+from ciclopscontroller.ephemeris.loader import get_timescale, get_ephemeris
+from ciclopscontroller.ephemeris.frames import PositionFrame, Observer, topo_to_altaz, altaz_rates
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
 
 import skyfield.api as sf
 from skyfield.framelib import itrs
 import numpy as np
-import astropy.units as u
-import astropy.coordinates as coord
-from astropy.time import Time as astropy_time
+from datetime import datetime
 from enum import Enum
+from functools import partial
+from typing import NamedTuple
 
-class PositionFrame(Enum):
-    ITRS = 'itrs'
-    TOPO = 'topo'
-    ALTAZ = 'altaz'
+class EphemerisBackend(Enum):
+    HERMITE = 'hermite'
+    CHEBYSHEV = 'chebyshev'
+
+class FrameSnapshot(NamedTuple):
+    # Everything the views draw for one tick, all evaluated at the same time_since_epoch
+    time_since_epoch: float
+    itrs: np.ndarray            # (1, 3) km
+    topo: np.ndarray            # (1, 3) km, East North Up
+    altaz: np.ndarray           # (1, 2) rad
+    trail_itrs: np.ndarray      # (n_trail, 3)
+    trail_topo: np.ndarray      # (n_trail, 3)
+    trail_altaz: np.ndarray     # (n_trail, 2)
+    sun_direction: np.ndarray   # (3,) ITRS unit vector
+
+class CacheSet(NamedTuple):
+    # Swapped as a whole so a lookup from any thread never pairs a cache with another cache's epoch
+    ephemeris: EphemerisCache
+    sun_moon: EphemerisCache
+    epoch: datetime             # Epoch the caches' seconds are counted from
 
 class SatController(QObject):
+    # Emitted from the SatController thread, so connections from the GUI are queued and never block it
+    snapshot_ready = Signal(object)
+    recompute_progress = Signal(float)  # Fraction done of an epoch change recompute, 1.0 once swapped in
+    shutdown_requested = Signal()  # Blocks the emitting thread until this thread's timers have stopped
+
     def __init__(self, time_controller: TimeController):
         super().__init__()
         self.time_controller = time_controller
         self.satellite = None
-        self.cached_positions = None
-        self.cached_topo_positions = None
-        self.cached_topo_angles = None
-        self.cached_dts = None
+        self.catalog = None
+        self._selected_catalog = None
+        self.satellite_index = 0
+        self.ephemeris_backend = EphemerisBackend.HERMITE
+        self._chebyshev = None  # (ChebyshevEphemeris, epoch it was fitted on)
+        self.disk_cache = DiskCache()
+        self._cache_timer = None
+        self._latency_probe = None
+        self._recompute_generation = 0
+        self._recompute_epoch = None
 
-        eph = sf.load('de421.bsp')
+        eph = get_ephemeris()
         self.earth_eph = eph['earth']
         self.sun_eph = eph['sun']
+        self.moon_eph = eph['moon']
+
+        # The caches' epoch lags the clock's while a recompute for a new epoch is running, every lookup is
+        # shifted by the difference so the old caches stay usable until the new ones are swapped in
+        self._caches = self._make_caches(self.time_controller.get_epoch())
+        self.time_controller.epoch_changed.connect(self.recompute_for_epoch)
+        self.shutdown_requested.connect(self._shutdown, Qt.ConnectionType.BlockingQueuedConnection)
 
         latitude = 51.4953
         longitude = 0.1790
-        self.observer = sf.wgs84.latlon(latitude, longitude)
+        self.observer = Observer(latitude, longitude)
+        self.visibility_filter = VisibilityFilter(self.observer)
         
         self.load_tle_data()
 
-    def load_tle_data(self):
-        satellites = sf.load.tle_file('tle.txt')
+    def load_tle_data(self, filename='tle.txt'):
+        satellites = sf.load.tle_file(filename, ts=get_timescale())
         self.satellite = satellites[0] if satellites else None
         if self.satellite is None:
             raise ValueError("No satellite loaded. Please load TLE data first.")
-        epoch = self.time_controller.get_epoch()
-        self.cached_dts = np.linspace(-720, 1320, 2000)
-        ts = sf.load.timescale()
-        times = ts.from_datetime(epoch) + self.cached_dts / 86400  # Convert seconds to days
-        self.cached_positions = np.array(self.satellite.at(times).frame_xyz(itrs).km).T  # Convert to km
-
-        difference = self.satellite - self.observer
-        topocentric = difference.at(times)
-        alt, az, distance = topocentric.altaz()
-        self.cached_topo_angles = np.array([alt.radians, az.radians]).T
-
-        alt = np.array(alt.radians)
-        az = np.array(az.radians)
-        distance = np.array(distance.km)
-
-        self.cached_topo_positions = np.array([
-            distance * np.cos(alt) * np.sin(az),
-            distance * np.cos(alt) * np.cos(az),
-            distance * np.sin(alt)
-        ]).T
+        self.catalog = Catalog(satellites)
+        self.satellite_index = 0
+        self._selected_catalog = Catalog([self.satellite])
+        self._chebyshev = None
+        caches = self._caches
+        caches.ephemeris.clear()
+        caches.ephemeris.advance(self.time_controller.get_time_since_epoch() + self._epoch_offset(caches.epoch))
+        if self._recompute_epoch is not None:
+            self.recompute_for_epoch(self._recompute_epoch)  # Its chunks were propagated for the old satellite
+
+    def _make_caches(self, epoch):
+        # Chunks are computed against a fixed epoch, never the clock's current one
+        ephemeris_cache = EphemerisCache(
+            partial(self._compute_cache_chunk, epoch=epoch),
+            chunk_duration=300,
+            samples_per_chunk=30,
+            max_chunks=24
+        )
+        # Geocentric Sun and Moon in ITRS, they move slowly enough for 5 minute Hermite samples
+        sun_moon_cache = EphemerisCache(
+            partial(self._compute_sun_moon_chunk, epoch=epoch),
+            chunk_duration=21600,
+            samples_per_chunk=72,
+            max_chunks=8,
+            lookahead=1
+        )
+        return CacheSet(ephemeris_cache, sun_moon_cache, epoch)
+
+    @property
+    def chebyshev_ephemeris(self):
+        chebyshev = self._chebyshev
+        return None if chebyshev is None else chebyshev[0]
+
+    def _epoch_offset(self, epoch, clock_epoch=None):
+        """Seconds to add to times counted from the clock's epoch to count them from ``epoch`` instead."""
+        if clock_epoch is None:
+            clock_epoch = self.time_controller.get_epoch()
+        return (clock_epoch - epoch).total_seconds()
+
+    def _compute_cache_chunk(self, dts, epoch):
+        # Not disk cached: one satellite's chunk propagates faster than a memory-mapped load, only coarse
+        # whole-catalog results like the Chebyshev fit are worth persisting
+        ts = get_timescale()
+        times = ts.from_datetime(epoch) + dts / 86400  # Convert seconds to days
+        itrs_positions, itrs_velocities = self._selected_catalog.propagate_itrs(times)
+        itrs_positions, itrs_velocities = itrs_positions[0], itrs_velocities[0]
+        topo_positions, topo_velocities = self.observer.itrs_to_topo(itrs_positions, itrs_velocities)
+
+        return {
+            PositionFrame.ITRS: (itrs_positions, itrs_velocities),
+            PositionFrame.TOPO: (topo_positions, topo_velocities),
+        }
+
+    def _compute_sun_moon_chunk(self, dts, epoch):
+        ts = get_timescale()
+        times = ts.from_datetime(epoch) + dts / 86400
+        chunk = {}
+        for name, body in (('sun', self.sun_eph), ('moon', self.moon_eph)):
+            positions, velocities = (body - self.earth_eph).at(times).frame_xyz_and_velocity(itrs)
+            chunk[name] = (np.array(positions.km).T, np.array(velocities.km_per_s).T)
+        return chunk
+
+    @Slot()
+    def initialize_timer(self):
+        # Must run on the SatController thread so the cache is extended there, not on the GUI thread
+        if self._cache_timer is None:
+            self._cache_timer = QTimer()
+            self._cache_timer.timeout.connect(self.update_cache)
+            self._cache_timer.start(1000)
+        if self._latency_probe is None:
+            self._latency_probe = LatencyProbe('sat')  # Created here to live on this thread, idle until profiling
+
+    @Slot()
+    def _shutdown(self):
+        # Timers can only be stopped from their own thread
+        self._recompute_generation += 1  # Drops any recompute still queued
+        if self._cache_timer is not None:
+            self._cache_timer.stop()
+        if self._latency_probe is not None:
+            self._latency_probe.stop()
+
+    @Slot(object)
+    def recompute_for_epoch(self, epoch):
+        """
+        Rebuild the caches for a new epoch into a second set, one chunk per event loop turn so snapshot
+        requests keep being served from the old set in between, then swap them in at once. The old set is
+        frozen meanwhile, so it is not extended with chunks that are about to be thrown away.
+        """
+        self._recompute_generation += 1
+        generation = self._recompute_generation
+        self._recompute_epoch = epoch
+        old_caches = self._caches
+        old_caches.ephemeris.frozen = old_caches.sun_moon.frozen = True
+        caches = self._make_caches(epoch)
+        ephemeris_cache, sun_moon_cache = caches.ephemeris, caches.sun_moon
+
+        playhead = self.time_controller.get_time_since_epoch()
+        duration = ephemeris_cache.chunk_duration
+        first = int(np.floor((playhead - ephemeris_cache.lookbehind * duration) / duration))
+        last = int(np.floor((playhead + ephemeris_cache.lookahead * duration) / duration))
+        steps = [lambda: sun_moon_cache.advance(playhead)]
+        if self.satellite is not None:
+            steps += [partial(ephemeris_cache.ensure, index * duration, index * duration) for index in range(first, last + 1)]
+
+        def run_step(index):
+            if generation != self._recompute_generation:
+                return  # Superseded by a newer epoch change
+            if index < len(steps):
+                steps[index]()
+                self.recompute_progress.emit((index + 1) / (len(steps) + 1))
+                QTimer.singleShot(0, lambda: run_step(index + 1))
+                return
+            # One assignment, lookups on other threads (the mount's tracking loop) see either set whole
+            self._caches = caches
+            self._recompute_epoch = None
+            self.recompute_progress.emit(1.0)
+
+        run_step(0)
+
+    @Slot()
+    def update_cache(self):
+        caches = self._caches
+        time_since_epoch = self.time_controller.get_time_since_epoch() + self._epoch_offset(caches.epoch)
+        caches.sun_moon.advance(time_since_epoch)
+        if self.satellite is None:
+            return
+        caches.ephemeris.advance(time_since_epoch)
+
+    @Slot()
+    def publish_snapshot(self):
+        # Runs on the SatController thread when requested through a queued signal. Always answers, with
+        # None when there is nothing to draw or the snapshot failed, so the requester never waits on a
+        # reply that won't come
+        snapshot = None
+        try:
+            if self.satellite is not None:
+                snapshot = self.get_snapshot()
+        finally:
+            self.snapshot_ready.emit(snapshot)
 
     def get_sat_position(self, frame: PositionFrame):
         return self.get_sat_positions([self.time_controller.get_time_since_epoch()], frame)
 
     def get_sat_positions(self, times, frame: PositionFrame):
-        if self.cached_dts is None:
-            raise ValueError("No satellite time data cached. Call load_tle_data() first.")
-        if frame == PositionFrame.ITRS:
-            if self.cached_positions is None:
-                raise ValueError("Satellite ITRS positions not cached, check load_tle_data() method.")
-            cache = self.cached_positions
-        elif frame == PositionFrame.TOPO:
-            if self.cached_topo_positions is None:
-                raise ValueError("Satellite TOPO positions not cached, check load_tle_data() method.")
-            cache = self.cached_topo_positions
-        elif frame == PositionFrame.ALTAZ:
-            if self.cached_topo_angles is None:
-                raise ValueError("Satellite ALTAZ angles not cached, check load_tle_data() method.")
-            cache = self.cached_topo_angles
-
-        times = np.atleast_1d(times)
-        if self.cached_positions is None or self.cached_topo_positions is None or self.cached_dts is None:
-            raise ValueError("Satellite positions not cached, check load_tle_data() method.")
-        
-        if np.any(times < self.cached_dts[0]) or np.any(times > self.cached_dts[-1]):
-            times = np.clip(times, self.cached_dts[0], self.cached_dts[-1])
-            
-        # Get the two closest times in the cache
-        upper_idx = np.searchsorted(self.cached_dts, times, side='left')
-        exact_match = (upper_idx < len(self.cached_dts)) & (self.cached_dts[upper_idx] == times)
-        upper_idx = np.clip(upper_idx, 1, len(self.cached_dts) - 1)
-        lower_idx = upper_idx - 1
-
-        ts_upper = self.cached_dts[upper_idx]
-        ts_lower = self.cached_dts[lower_idx]
-
-        # Avoid division by zero for exact matches    
-        with np.errstate(divide='ignore', invalid='ignore'):
-            weights_upper = (times - ts_lower) / (ts_upper - ts_lower)
-            weights_upper[exact_match] = 0
-        weights_lower = 1 - weights_upper
-        weights_lower[exact_match] = 1
-        return (
-            weights_lower[:, None] * cache[lower_idx] +
-            weights_upper[:, None] * cache[upper_idx]
+        return self._sat_positions(np.asarray(times, dtype=float), frame, self.time_controller.get_epoch())
+
+    def _sat_positions(self, times, frame: PositionFrame, clock_epoch):
+        # ``times`` are seconds since ``clock_epoch``, each ephemeris shifts them to its own epoch
+        if self.satellite is None:
+            raise ValueError("No satellite loaded. Call load_tle_data() first.")
+        chebyshev = self._chebyshev
+        if self.ephemeris_backend == EphemerisBackend.CHEBYSHEV and chebyshev is not None:
+            chebyshev_ephemeris, epoch = chebyshev
+            chebyshev_times = times + self._epoch_offset(epoch, clock_epoch)
+            if chebyshev_ephemeris.covers(chebyshev_times):
+                itrs_positions = chebyshev_ephemeris.evaluate(chebyshev_times, [self.satellite_index])[0]
+                if frame == PositionFrame.ALTAZ_RATE:
+                    itrs_velocities = chebyshev_ephemeris.evaluate(chebyshev_times, [self.satellite_index], derivative=True)[0]
+                    return self.observer.convert_rates(itrs_positions, itrs_velocities)
+                return self.observer.convert(itrs_positions, frame)
+        # Falls back to the Hermite cache outside the fitted Chebyshev window
+        caches = self._caches
+        ephemeris_cache = caches.ephemeris
+        times = times + self._epoch_offset(caches.epoch, clock_epoch)
+        if frame == PositionFrame.ALTAZ_RATE:
+            # Rates from the interpolated ENU velocity, exact at any sample density unlike np.gradient
+            return altaz_rates(
+                ephemeris_cache.interpolate(times, PositionFrame.TOPO),
+                ephemeris_cache.interpolate(times, PositionFrame.TOPO, derivative=True)
+            )
+        if frame == PositionFrame.ALTAZ:
+            # Angles are taken from the interpolated vectors, interpolating them directly breaks near zenith
+            return topo_to_altaz(ephemeris_cache.interpolate(times, PositionFrame.TOPO))
+        return ephemeris_cache.interpolate(times, frame)
+
+    def get_snapshot(self, trail_start=-30, trail_end=60, n_trail=100) -> FrameSnapshot:
+        """
+        Evaluate everything the views need for one frame at a single read of the clock. The current
+        position and the trail share one interpolation per frame and ALTAZ is derived from TOPO, so the
+        three views cost two cache lookups together instead of two each.
+        """
+        with PROFILER.stage('interpolation'):
+            state = self.time_controller.get_state()
+            time_since_epoch = state.time_since_epoch()
+            times = np.concatenate([[time_since_epoch], np.linspace(trail_start, trail_end, n_trail) + time_since_epoch])
+            itrs_positions = self._sat_positions(times, PositionFrame.ITRS, state.epoch)
+            topo_positions = self._sat_positions(times, PositionFrame.TOPO, state.epoch)
+            altaz_positions = topo_to_altaz(topo_positions)
+            caches = self._caches
+            sun_itrs = caches.sun_moon.interpolate(time_since_epoch + self._epoch_offset(caches.epoch, state.epoch), 'sun')[0]
+
+        arrays = [itrs_positions, topo_positions, altaz_positions, sun_itrs / np.linalg.norm(sun_itrs)]
+        for array in arrays:
+            array.flags.writeable = False  # Shared by every view, nobody may modify it in place
+        itrs_positions, topo_positions, altaz_positions, sun_direction = arrays
+        return FrameSnapshot(
+            time_since_epoch=time_since_epoch,
+            itrs=itrs_positions[:1],
+            topo=topo_positions[:1],
+            altaz=altaz_positions[:1],
+            trail_itrs=itrs_positions[1:],
+            trail_topo=topo_positions[1:],
+            trail_altaz=altaz_positions[1:],
+            sun_direction=sun_direction
         )
 
     def get_trail_positions(self, start_time, end_time, n_points, frame: PositionFrame):        
@@ -111,23 +294,115 @@ class SatController(QObject):
         times = np.linspace(start_time, end_time, n_points) + self.time_controller.get_time_since_epoch()
         return self.get_sat_positions(times, frame)
 
+    def set_ephemeris_backend(self, backend: EphemerisBackend):
+        self.ephemeris_backend = backend
+
+    def fit_chebyshev(self, start, end, segment_duration=1200, degree=12):
+        """Fit Chebyshev segments for the whole catalog over ``[start, end]`` seconds since epoch."""
+        if self.catalog is None:
+            raise ValueError("No catalog loaded. Call load_tle_data() first.")
+        # Fitted on the caches' epoch, it keeps its own so lookups stay right across epoch changes
+        epoch = self._caches.epoch
+        offset = self._epoch_offset(epoch)
+        start, end = start + offset, end + offset
+        key = DiskCache.make_key(
+            kind='chebyshev',
+            tle=tle_lines(self.catalog.satellites),
+            epoch=epoch.isoformat(),
+            start=start,
+            end=end,
+            segment_duration=segment_duration,
+            degree=degree
+        )
+        arrays = self.disk_cache.load(key)
+        if arrays is not None:
+            chebyshev_ephemeris = ChebyshevEphemeris(start, arrays['coefficients'], segment_duration)
+        else:
+            ts = get_timescale()
+            chebyshev_ephemeris = ChebyshevEphemeris.fit(
+                self.catalog, ts.from_datetime(epoch), start, end, segment_duration=segment_duration, degree=degree
+            )
+            self.disk_cache.save(key, {'coefficients': chebyshev_ephemeris.coefficients})
+        self._chebyshev = (chebyshev_ephemeris, epoch)
+        return chebyshev_ephemeris
+
+    def get_catalog_positions(self, times, frame: PositionFrame, indices=None):
+        """Evaluate the fitted Chebyshev catalog, returns (n_sats, n_times, 3) or (n_sats, n_times, 2) for ALTAZ."""
+        chebyshev = self._chebyshev
+        if chebyshev is None:
+            raise ValueError("No Chebyshev ephemeris fitted. Call fit_chebyshev() first.")
+        chebyshev_ephemeris, epoch = chebyshev
+        times = np.asarray(times, dtype=float) + self._epoch_offset(epoch)
+        itrs_positions = chebyshev_ephemeris.evaluate(times, indices)
+        if frame == PositionFrame.ALTAZ_RATE:
+            itrs_velocities = chebyshev_ephemeris.evaluate(times, indices, derivative=True)
+            return self.observer.convert_rates(itrs_positions, itrs_velocities)
+        return self.observer.convert(itrs_positions, frame)
+
+    def predict_passes(self, start, end, min_elevation=0.0, processes=1, observable_only=False):
+        """
+        Predict every catalog pass over the observer in ``[start, end]`` seconds since epoch, above
+        ``min_elevation`` radians. Returns a structured array of ``passes.PASS_DTYPE`` sorted by rise time,
+        with ``observable_only`` passes that are never sunlit against a dark sky above the mask are dropped.
+        """
+        if self.catalog is None:
+            raise ValueError("No catalog loaded. Call load_tle_data() first.")
+        ts = get_timescale()
+        predictor = PassPredictor(
+            self.catalog, self.observer, min_elevation=min_elevation,
+            visibility=self.visibility_filter, sun_positions=self.get_sun_positions
+        )
+        passes = predictor.predict(ts.from_datetime(self.time_controller.get_epoch()), start, end, processes=processes)
+        if observable_only:
+            passes = passes[passes['visible_duration'] > 0]
+        return passes
+
+    def set_horizon_mask(self, azimuths, elevations):
+        """Set the per-azimuth minimum elevation (both in radians) used by the visibility filter."""
+        self.visibility_filter.horizon_mask = HorizonMask(azimuths, elevations)
+
+    def get_visibility(self, dts, indices=None):
+        """Return a (n_sats, n_times) bool array, True where a catalog object is observable at ``dts``."""
+        dts = np.atleast_1d(np.asarray(dts, dtype=float))
+        chebyshev = self._chebyshev
+        chebyshev_dts = None if chebyshev is None else dts + self._epoch_offset(chebyshev[1])
+        if chebyshev is not None and chebyshev[0].covers(chebyshev_dts):
+            sat_itrs = chebyshev[0].evaluate(chebyshev_dts, indices)
+        else:
+            sat_itrs = self.propagate_catalog(dts)
+            if indices is not None:
+                sat_itrs = sat_itrs[indices]
+        return self.visibility_filter.observable(sat_itrs, self.get_sun_positions(dts))
+
+    def get_sun_positions(self, dts):
+        """Sun ITRS positions (km) at seconds since epoch ``dts``, of shape (n_times, 3)."""
+        caches = self._caches
+        return caches.sun_moon.interpolate(np.asarray(dts, dtype=float) + self._epoch_offset(caches.epoch), 'sun')
+
+    def get_moon_positions(self, dts):
+        """Geocentric Moon ITRS positions (km) at seconds since epoch ``dts``, of shape (n_times, 3)."""
+        caches = self._caches
+        return caches.sun_moon.interpolate(np.asarray(dts, dtype=float) + self._epoch_offset(caches.epoch), 'moon')
+
+    def propagate_catalog(self, dts, frame: PositionFrame = PositionFrame.ITRS):
+        """Propagate every loaded satellite over seconds-since-epoch ``dts``, returns shape (n_sats, n_times, 3), or 2 for ALTAZ."""
+        if self.catalog is None:
+            raise ValueError("No catalog loaded. Call load_tle_data() first.")
+        ts = get_timescale()
+        times = ts.from_datetime(self.time_controller.get_epoch()) + np.atleast_1d(dts) / 86400
+        positions, velocities = self.catalog.propagate_itrs(times)
+        if frame == PositionFrame.ALTAZ_RATE:
+            return self.observer.convert_rates(positions, velocities)
+        return self.observer.convert(positions, frame)
+
     def get_observer_position(self):
-        t = sf.load.timescale().now()
-        return self.observer.at(t).frame_xyz(itrs).km
+        # The site is fixed in ITRS, no need to evaluate it at the current time
+        return self.observer.itrs
 
     def get_sun_direction(self):
-        t = sf.load.timescale().from_datetime(self.time_controller.get_datetime())
-        obstime = astropy_time(self.time_controller.get_datetime())
-
-        sun_icrs = (self.sun_eph - self.earth_eph).at(t).position.km
-        sun_icrs = coord.SkyCoord(
-            x=sun_icrs[0] * u.km,
-            y=sun_icrs[1] * u.km,
-            z=sun_icrs[2] * u.km,
-            frame='icrs',
-            representation_type='cartesian',
-            obstime=obstime
-        )
-        sun_itr = sun_icrs.transform_to('itrs').cartesian.xyz.value
-        sun_direction = sun_itr / np.linalg.norm(sun_itr)
-        return sun_direction
+        sun_itrs = self.get_sun_positions(self.time_controller.get_time_since_epoch())[0]
+        return sun_itrs / np.linalg.norm(sun_itrs)
+
+    def get_moon_direction(self):
+        moon_itrs = self.get_moon_positions(self.time_controller.get_time_since_epoch())[0]
+        return moon_itrs / np.linalg.norm(moon_itrs)
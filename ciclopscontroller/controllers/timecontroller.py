@@ -1,102 +1,116 @@
-from PySide6.QtCore import QObject, QMutex, QTimer, Qt, Slot, QMutexLocker
+from PySide6.QtCore import QObject, QMutex, Signal, Slot, QMutexLocker
 from datetime import datetime, timedelta, timezone
 from time import perf_counter
+from typing import NamedTuple
+
+
+class ClockState(NamedTuple):
+    epoch: datetime
+    reference_counter: float  # perf_counter() at the last change
+    reference_time: float     # Seconds since epoch at reference_counter
+    speed: float
+    running: bool
+    step: float | None = None  # Fixed dt in seconds in stepped mode, None follows the wall clock
+    tick: int = 0              # Steps taken since reference_time in stepped mode
+
+    def time_since_epoch(self) -> float:
+        if self.step is not None:
+            # Multiply rather than accumulate so every run lands on exactly the same times
+            return self.reference_time + self.tick * self.step
+        if not self.running:
+            return self.reference_time
+        return self.reference_time + (perf_counter() - self.reference_counter) * self.speed
 
 
 class TimeController(QObject):
+    epoch_changed = Signal(object)  # New epoch datetime, SatController recomputes its caches on it
+
     def __init__(self) -> None:
+        """
+        Simulation clock evaluated on demand. The whole clock is one immutable ClockState that writers
+        replace in a single assignment, so readers on any thread never lock and nothing has to tick while
+        nobody is asking for the time. The mutex only serialises writers.
+
+        In stepped mode (set_stepped()) the clock ignores the wall clock entirely and only moves when
+        advance() is called, so headless runs can go as fast as the work allows and reproduce exactly.
+        """
         super().__init__()
-        self._timer: QTimer | None = None
-        self._epoch = datetime(2025, 7, 14, 22, 24, 0, tzinfo=timezone.utc)
-        self._time_since_epoch: float = 0
-        self._speed: float = 1
-        self._reference_counter: float = 0
-        self._reference_time: float = 0
-        self._cycles = 0
-        self._running = False
+        self._state = ClockState(
+            epoch=datetime(2025, 7, 14, 22, 24, 0, tzinfo=timezone.utc),
+            reference_counter=perf_counter(),
+            reference_time=0,
+            speed=1,
+            running=False
+        )
         self._mutex = QMutex()
 
-    def initialize_timer(self) -> None:
-        if self._timer is None:
-            self._timer = QTimer(timerType=Qt.TimerType.PreciseTimer)
-            self._timer.timeout.connect(self.run)
+    def get_state(self) -> ClockState:
+        return self._state
 
     def get_datetime(self) -> datetime:
-        with QMutexLocker(self._mutex):
-            time = self._epoch + timedelta(seconds=self._time_since_epoch)
-        return time
-    
+        state = self._state
+        return state.epoch + timedelta(seconds=state.time_since_epoch())
+
     def get_running(self) -> bool:
-        with QMutexLocker(self._mutex):
-            return self._running
-        
+        return self._state.running
+
     def get_epoch(self) -> datetime:
-        with QMutexLocker(self._mutex):
-            return self._epoch
-        
+        return self._state.epoch
+
     def get_time_since_epoch(self) -> float:
+        return self._state.time_since_epoch()
+
+    def _rebase(self, **changes) -> None:
+        # Fold the elapsed time into the reference so changing speed or running keeps the clock continuous
         with QMutexLocker(self._mutex):
-            return self._time_since_epoch
+            state = self._state
+            counter = perf_counter()
+            reference_time = state.reference_time
+            if state.step is not None:
+                reference_time += state.tick * state.step
+            elif state.running:
+                reference_time += (counter - state.reference_counter) * state.speed
+            changes.setdefault('reference_time', reference_time)
+            changes.setdefault('tick', 0)
+            self._state = state._replace(reference_counter=counter, **changes)
 
     Slot()
     def start_playback(self) -> None:
-        if self._timer is None:
-            raise Exception("Timer not initialized. Call initialize_timer() first.")
-        with QMutexLocker(self._mutex):
-            self._reference_counter = perf_counter()
-            self._reference_time = self._time_since_epoch
-            self._running = True
-        self._timer.start(1)
-        
+        self._rebase(running=True)
 
     Slot()
     def stop_playback(self) -> None:
-        if self._timer is None:
-            raise Exception("Timer not initialized. Call initialize_timer() first.")
-        self._timer.stop()
-        with QMutexLocker(self._mutex):
-            self._running = False
-
-    Slot()
-    def run(self) -> None:
-        with QMutexLocker(self._mutex):
-            current_counter = perf_counter()
-            elapsed_real_time = current_counter - self._reference_counter
-
-            self._time_since_epoch = self._reference_time + elapsed_real_time * self._speed
-
-            # For debugging purposes, print the current time and cycles
-            # if self._cycles % 1000 == 0:
-                # print(f"{self._time_since_epoch:.2f} seconds, Cycles: {self._cycles}, speed: {self._speed}x, Real Time = {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-2]}, Counter = {current_counter-self._reference_counter:.2f}, Reference Time = {self._reference_time:.2f}")
+        self._rebase(running=False)
 
-            self._cycles += 1
-        
     Slot()
     def set_speed(self, speed):
-        with QMutexLocker(self._mutex):
-            current_counter = perf_counter()
-            elapsed_real_time = current_counter - self._reference_counter
+        self._rebase(speed=speed)
 
-            self._reference_time += elapsed_real_time * self._speed
-            self._reference_counter = current_counter
-            self._speed = speed
-        
     Slot()
     def set_time(self, now:bool=False, time_since_epoch:float=0) -> None:
-        with QMutexLocker(self._mutex):
-            if now:
-                self._time_since_epoch = (datetime.now(timezone.utc) - self._epoch).total_seconds() #Be careful of using .seconds(), it removes days!
-            else:
-                self._time_since_epoch = time_since_epoch
-
-            self._reference_counter = perf_counter()
-            self._reference_time = self._time_since_epoch
+        if now:
+            time_since_epoch = (datetime.now(timezone.utc) - self._state.epoch).total_seconds() #Be careful of using .seconds(), it removes days!
+        self._rebase(reference_time=time_since_epoch)
 
     Slot()
     def set_epoch(self, new_datetime: datetime):
-        self.stop_playback()
+        self._rebase(epoch=new_datetime, reference_time=0, running=False)
+        self.epoch_changed.emit(new_datetime)
+
+    def set_stepped(self, step: float) -> None:
+        """Freeze the clock at its current time and from now on only move it by ``step`` seconds per advance()."""
+        if step <= 0:
+            raise ValueError("Step must be a positive number of seconds.")
+        self._rebase(step=float(step))
+
+    def set_realtime(self) -> None:
+        self._rebase(step=None)
+
+    def advance(self, steps: int = 1) -> float:
+        """Move a stepped clock forward by ``steps`` ticks and return the new time since epoch."""
         with QMutexLocker(self._mutex):
-            self._epoch = new_datetime
-            self._time_since_epoch = 0
-            self._reference_counter = perf_counter()
-            self._reference_time = 0
+            state = self._state
+            if state.step is None:
+                raise ValueError("Clock is not stepped. Call set_stepped() first.")
+            self._state = state._replace(tick=state.tick + steps)
+            return self._state.time_since_epoch()
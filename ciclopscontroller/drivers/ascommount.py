@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+from time import perf_counter
+
+from ciclopscontroller.drivers.mountdriver import MountDriver, MountAxis, MountPosition
+
+
+class AscomMount(MountDriver):
+    def __init__(self, driver_id=None):
+        """
+        Any ASCOM telescope driver (OmniSim, 10Micron ASCOM driver, ...) through COM, Windows only.
+        ``driver_id`` of None opens the ASCOM chooser on connect().
+
+        COM failures are re-raised as OSError, the link error MountWorker handles. Every property read is a
+        cross-process round trip, so ``connected`` is tracked here rather than asked of the driver: set by
+        connect() and disconnect(), and re-read from the driver only after a call has failed.
+        """
+        self.driver_id = driver_id
+        self.mount = None
+        self._connected = False
+        self._com_error = ()  # pywintypes.com_error once pywin32 is imported, catches nothing before that
+
+    @contextmanager
+    def _com_errors(self):
+        try:
+            yield
+        except self._com_error as e:
+            try:
+                self._connected = self.mount is not None and bool(self.mount.Connected)
+            except self._com_error:
+                self._connected = False  # Driver or link gone, commands will reconnect
+            raise OSError(f"ASCOM call failed: {e}") from e
+
+    def connect(self):
+        # Imported here so the rest of the application runs without pywin32
+        import pythoncom
+        import pywintypes
+        import win32com.client
+        self._com_error = pywintypes.com_error
+        with self._com_errors():
+            pythoncom.CoInitialize()  # COM has to be initialized on every thread using it, e.g. the mount I/O thread
+            if self.driver_id is None:
+                chooser = win32com.client.Dispatch("ASCOM.Utilities.Chooser")
+                chooser.DeviceType = "Telescope"
+                self.driver_id = chooser.Choose(None)
+                if not self.driver_id:
+                    raise ValueError("No mount selected in the ASCOM chooser.")
+            self.mount = win32com.client.Dispatch(self.driver_id)
+            if not self.mount.Connected:
+                self.mount.Connected = True
+        self._connected = True
+
+    def disconnect(self):
+        self._connected = False
+        if self.mount is not None:
+            mount, self.mount = self.mount, None
+            with self._com_errors():
+                mount.Connected = False
+
+    @property
+    def connected(self):
+        return self._connected
+
+    def read_position(self):
+        timestamp = perf_counter()
+        with self._com_errors():
+            return MountPosition(timestamp, self.mount.Azimuth, self.mount.Altitude)
+
+    def move_axis(self, axis: MountAxis, rate: float):
+        with self._com_errors():
+            self.mount.MoveAxis(axis.value, rate)
+
+    def slew_to_altaz(self, azimuth: float, elevation: float):
+        with self._com_errors():
+            self.mount.SlewToAltAzAsync(azimuth, elevation)
+
+    def abort(self):
+        with self._com_errors():
+            self.mount.AbortSlew()
+            self.mount.MoveAxis(MountAxis.AZIMUTH.value, 0)
+            self.mount.MoveAxis(MountAxis.ELEVATION.value, 0)
@@ -0,0 +1,177 @@
+import socket
+from time import perf_counter
+
+from ciclopscontroller.drivers.mountdriver import MountDriver, MountAxis, MountPosition
+
+DEFAULT_PORT = 3492  # 10Micron command port
+
+# Directions used for the :Mx# moves on an alt-az mount, (positive, negative) rate
+MOVE_DIRECTIONS = {
+    MountAxis.AZIMUTH: ("e", "w"),
+    MountAxis.ELEVATION: ("n", "s"),
+}
+RATE_COMMANDS = {
+    MountAxis.AZIMUTH: "RA",
+    MountAxis.ELEVATION: "RE",
+}
+
+# Reply kinds: NO_REPLY commands are fire-and-forget, CHAR_REPLY answer with a single character,
+# STRING_REPLY answer with a '#'-terminated string
+NO_REPLY = 0
+CHAR_REPLY = 1
+STRING_REPLY = 2
+
+
+class LX200Mount(MountDriver):
+    def __init__(self, host, port=DEFAULT_PORT, timeout=1.0):
+        """
+        =========  ===================================================================
+        **Arguments:**
+        host       Mount IP address or hostname
+        port       TCP command port, 3492 on 10Micron mounts
+        timeout    Seconds to wait for a reply before the link is considered broken
+        =========  ===================================================================
+
+        Talks the 10Micron LX200 command set straight over TCP instead of through the ASCOM COM layer.
+        The socket is kept open between calls, every poll is a single :Ginfo# round trip and the commands
+        making up one operation (rate + direction, azimuth + altitude target) are written in one packet, with their
+        replies read back afterwards in order.
+
+        Commands used:
+            :U2#                     high precision coordinates, no reply
+            :Ginfo#                  RA,Dec,pier side,Az,Alt,JD,status,slewing#  (decimal hours/degrees)
+            :RAsDD.DDDD#, :REsDD.DDDD#  azimuth / altitude move rate in deg/s, no reply
+            :Me#, :Mw#, :Mn#, :Ms#   move at the set rate, no reply
+            :Qe#, :Qw#, :Qn#, :Qs#   stop a move direction, no reply
+            :SzDDD*MM:SS.S#          target azimuth, replies 1 / 0
+            :SasDD*MM:SS.S#          target altitude, replies 1 / 0
+            :MA#                     slew to the alt-az target, replies 0 on success
+            :Q#                      stop everything, no reply
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        self.round_trip = None  # Seconds taken by the last position poll
+        self._socket = None
+        self._buffer = bytearray()
+
+    def connect(self):
+        self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buffer.clear()
+        self._transact([(":U2#", NO_REPLY)])
+
+    def disconnect(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    @property
+    def connected(self):
+        return self._socket is not None
+
+    def read_position(self):
+        start = perf_counter()
+        info, = self._transact([(":Ginfo#", STRING_REPLY)])
+        end = perf_counter()
+        self.round_trip = end - start
+
+        # Short or garbled after a firmware error or a resync, ValueError is what the mount worker handles
+        fields = info.split(",")
+        try:
+            if len(fields) < 5:
+                raise ValueError
+            azimuth, elevation = float(fields[3]), float(fields[4])
+        except ValueError:
+            raise ValueError(f"Malformed :Ginfo# reply {info!r}.") from None
+        # The mount samples somewhere inside the round trip, the midpoint is the best guess
+        return MountPosition((start + end) / 2, azimuth % 360, elevation)
+
+    def move_axis(self, axis: MountAxis, rate: float):
+        positive, negative = MOVE_DIRECTIONS[axis]
+        if rate == 0:
+            self._transact([(f":Q{positive}#", NO_REPLY), (f":Q{negative}#", NO_REPLY)])
+            return
+        direction = positive if rate > 0 else negative
+        self._transact([
+            (f":{RATE_COMMANDS[axis]}{abs(rate):+08.4f}#", NO_REPLY),
+            (f":M{direction}#", NO_REPLY),
+        ])
+
+    def slew_to_altaz(self, azimuth: float, elevation: float):
+        azimuth %= 360
+        if azimuth >= 360 - 1 / 72000:  # Would round up to 360*00:00.0
+            azimuth = 0.0
+        set_azimuth, set_altitude = self._transact([
+            (f":Sz{format_sexagesimal(azimuth, 3, signed=False)}#", CHAR_REPLY),
+            (f":Sa{format_sexagesimal(elevation, 2, signed=True)}#", CHAR_REPLY),
+        ])
+        if set_azimuth != "1" or set_altitude != "1":
+            raise ValueError(f"Mount rejected target azimuth {azimuth:.4f}, elevation {elevation:.4f}.")
+        # Not pipelined with the targets, :MA# would otherwise slew to the old target after a rejection
+        slew, = self._transact([(":MA#", CHAR_REPLY)])
+        if slew != "0":
+            raise ValueError(f"Mount refused to slew (code {slew}).")
+
+    def abort(self):
+        self._transact([(":Q#", NO_REPLY)])
+
+    def _transact(self, commands):
+        """Write all ``commands`` in one packet, then read their replies in order."""
+        if self._socket is None:
+            raise ValueError("Mount not connected. Call connect() first.")
+        try:
+            return self._exchange(commands)
+        except (OSError, ConnectionError):
+            # The mount drops idle connections, reconnect once and retry before giving up
+            self.disconnect()
+            self.connect()
+            return self._exchange(commands)
+
+    def _exchange(self, commands):
+        self._socket.sendall("".join(command for command, _ in commands).encode("ascii"))
+        replies = []
+        for _, reply in commands:
+            if reply == CHAR_REPLY:
+                replies.append(self._read(1))
+            elif reply == STRING_REPLY:
+                replies.append(self._read_until(b"#"))
+        return replies
+
+    def _read(self, n):
+        while len(self._buffer) < n:
+            self._receive()
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return data.decode("ascii")
+
+    def _read_until(self, terminator):
+        while (end := self._buffer.find(terminator)) < 0:
+            self._receive()
+        data = bytes(self._buffer[:end])
+        del self._buffer[:end + len(terminator)]
+        return data.decode("ascii")
+
+    def _receive(self):
+        data = self._socket.recv(4096)
+        if not data:
+            raise ConnectionError("Mount closed the connection.")
+        self._buffer += data
+
+
+def format_sexagesimal(value, degree_digits, signed):
+    """Format degrees as [s]DD*MM:SS.S, the high precision LX200 coordinate format."""
+    sign = "-" if value < 0 else "+"
+    tenths = round(abs(value) * 36000)
+    degrees, tenths = divmod(tenths, 36000)
+    minutes, tenths = divmod(tenths, 600)
+    text = f"{degrees:0{degree_digits}d}*{minutes:02d}:{tenths / 10:04.1f}"
+    return sign + text if signed else text
+
+
+def parse_sexagesimal(text):
+    sign = -1 if text.startswith("-") else 1
+    degrees, rest = text.lstrip("+-").split("*")
+    minutes, seconds = rest.split(":")
+    return sign * (int(degrees) + int(minutes) / 60 + float(seconds) / 3600)
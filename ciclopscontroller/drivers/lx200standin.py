@@ -0,0 +1,105 @@
+import socketserver
+import threading
+from time import sleep
+
+from ciclopscontroller.drivers.mountdriver import MountAxis
+from ciclopscontroller.drivers.simulatedmount import SimulatedMount
+from ciclopscontroller.drivers.lx200mount import MOVE_DIRECTIONS, RATE_COMMANDS, parse_sexagesimal
+
+
+class LX200StandIn:
+    def __init__(self, mount: SimulatedMount = None, host="127.0.0.1", port=0, reply_delay=0.0):
+        """
+        ===========  =============================================================================
+        **Arguments:**
+        mount        SimulatedMount answering the commands, a default one is made if None
+        host, port   Address to listen on, port 0 picks a free one (see ``address`` after start())
+        reply_delay  Extra seconds to sleep before answering each query, to mimic a slow link
+        ===========  =============================================================================
+
+        Local TCP server speaking the subset of the 10Micron LX200 protocol used by LX200Mount, so the
+        driver (and everything above it) can be exercised without a mount. RA/Dec are not modelled and
+        are reported as 0.
+        """
+        self.mount = mount or SimulatedMount()
+        self.reply_delay = reply_delay
+        self._lock = threading.Lock()  # SimulatedMount is not thread-safe, clients take turns
+        self._target = [0.0, 0.0]
+        self._rates = {MountAxis.AZIMUTH: 0.0, MountAxis.ELEVATION: 0.0}
+        self._server = socketserver.ThreadingTCPServer((host, port), self._make_handler(), bind_and_activate=False)
+        self._server.allow_reuse_address = True
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def start(self):
+        self._server.server_bind()
+        self._server.server_activate()
+        self.mount.connect()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="lx200-standin", daemon=True)
+        self._thread.start()
+        return self.address
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _make_handler(self):
+        stand_in = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                buffer = b""
+                while data := self.request.recv(4096):
+                    buffer += data
+                    *commands, buffer = buffer.split(b"#")
+                    replies = [stand_in.execute(command.decode("ascii")) for command in commands]
+                    reply = "".join(reply for reply in replies if reply)
+                    if reply:
+                        self.request.sendall(reply.encode("ascii"))
+
+        return Handler
+
+    def execute(self, command):
+        """Run one command (without the trailing '#'), returns the reply or None."""
+        command = command.lstrip(":")
+        with self._lock:
+            if command == "Ginfo":
+                if self.reply_delay:
+                    sleep(self.reply_delay)
+                position = self.mount.read_position()
+                slewing = int(self.mount.slewing)
+                status = 6 if slewing else 7
+                return f"0.000000,+00.00000,E,{position.azimuth:08.4f},{position.elevation:+08.4f},0.0,{status},{slewing}#"
+            if command == "U2":
+                return None
+            for axis, rate_command in RATE_COMMANDS.items():
+                if command.startswith(rate_command):
+                    self._rates[axis] = abs(float(command[len(rate_command):]))
+                    return None
+            for axis, (positive, negative) in MOVE_DIRECTIONS.items():
+                if command in (f"M{positive}", f"M{negative}"):
+                    sign = 1 if command[1] == positive else -1
+                    self.mount.move_axis(axis, sign * self._rates[axis])
+                    return None
+                if command in (f"Q{positive}", f"Q{negative}"):
+                    self.mount.move_axis(axis, 0)
+                    return None
+            if command.startswith("Sz"):
+                self._target[0] = parse_sexagesimal(command[2:])
+                return "1"
+            if command.startswith("Sa"):
+                self._target[1] = parse_sexagesimal(command[2:])
+                low, high = self.mount.elevation_limits
+                return "1" if low <= self._target[1] <= high else "0"
+            if command == "MA":
+                self.mount.slew_to_altaz(*self._target)
+                return "0"
+            if command == "Q":
+                self.mount.abort()
+                return None
+        return None  # Unknown commands are ignored, as the mount does
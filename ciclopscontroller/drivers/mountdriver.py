@@ -0,0 +1,51 @@
+from enum import Enum
+from time import perf_counter
+from typing import NamedTuple
+
+
+class MountAxis(Enum):
+    # Same numbering as ASCOM's TelescopeAxes for alt-az mounts
+    AZIMUTH = 0
+    ELEVATION = 1
+
+
+class MountPosition(NamedTuple):
+    timestamp: float  # driver.clock() when the position was sampled
+    azimuth: float    # Degrees, [0, 360)
+    elevation: float  # Degrees
+
+
+class MountDriver:
+    """
+    Interface every mount backend implements. Units follow ASCOM: degrees and degrees per second.
+    Drivers are not thread-safe, one thread (the mount I/O thread) owns a driver at a time.
+    """
+
+    def clock(self) -> float:
+        """Seconds on the clock MountPosition timestamps come from, safe to call from any thread."""
+        return perf_counter()
+
+    def connect(self) -> None:
+        raise NotImplementedError
+
+    def disconnect(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def connected(self) -> bool:
+        raise NotImplementedError
+
+    def read_position(self) -> MountPosition:
+        raise NotImplementedError
+
+    def move_axis(self, axis: MountAxis, rate: float) -> None:
+        """Drive ``axis`` at a constant ``rate`` (deg/s) until told otherwise, 0 stops it."""
+        raise NotImplementedError
+
+    def slew_to_altaz(self, azimuth: float, elevation: float) -> None:
+        """Start an asynchronous slew, returns immediately."""
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        """Stop any slew and all axis motion."""
+        raise NotImplementedError
@@ -0,0 +1,160 @@
+import heapq
+from itertools import count
+from time import perf_counter
+
+import numpy as np
+
+from ciclopscontroller.drivers.mountdriver import MountDriver, MountAxis, MountPosition
+
+SLEW_STEP = 0.01  # s, integration step while a position slew is in progress
+
+
+class SimulatedMount(MountDriver):
+    def __init__(self, max_rate=5.0, max_acceleration=10.0, encoder_resolution=1 / 3600,
+                 command_latency=0.05, elevation_limits=(0.0, 90.0), start=(0.0, 45.0), clock=perf_counter):
+        """
+        ==================  =================================================================================
+        **Arguments:**
+        max_rate            Fastest axis speed in deg/s, rate commands are clipped to it
+        max_acceleration    Axis acceleration limit in deg/s^2, rate changes ramp at this
+        encoder_resolution  Reported positions are quantized to this many degrees
+        command_latency     Seconds between a command being sent and the axes reacting to it
+        elevation_limits    (min, max) elevation in degrees, the elevation axis stops at either end
+        start               Initial (azimuth, elevation) in degrees
+        clock               Callable returning seconds, becomes the driver's clock(). For reproducible runs pass a
+                            stepped TimeController's get_time_since_epoch, see MountController.track_step()
+        ==================  =================================================================================
+
+        Pure-Python kinematic alt-az mount. Nothing runs in the background: the axes are integrated
+        lazily up to ``clock()`` whenever the mount is read or commanded, exactly for constant rates and
+        in SLEW_STEP steps during position slews.
+        """
+        self.max_rate = max_rate
+        self.max_acceleration = max_acceleration
+        self.encoder_resolution = encoder_resolution
+        self.command_latency = command_latency
+        self.elevation_limits = elevation_limits
+        self.clock = clock
+
+        self._connected = False
+        self._time = clock()
+        self._position = np.array(start, dtype=float)
+        self._velocity = np.zeros(2)
+        self._target_rate = np.zeros(2)
+        self._slew_target = None
+        self._pending = []  # Heap of (apply_time, sequence, is_slew, command)
+        self._sequence = count()
+
+    def connect(self):
+        self._advance(self.clock())
+        self._connected = True
+
+    def disconnect(self):
+        self._connected = False
+
+    @property
+    def connected(self):
+        return self._connected
+
+    @property
+    def slewing(self):
+        self._advance(self.clock())
+        # A slew still travelling to the mount counts, the mount has already answered that it is slewing
+        return self._slew_target is not None or any(slew for _, _, slew, _ in self._pending)
+
+    def read_position(self):
+        self._check_connected()
+        now = self.clock()
+        self._advance(now)
+        azimuth, elevation = np.round(self._position / self.encoder_resolution) * self.encoder_resolution
+        return MountPosition(now, float(azimuth % 360), float(elevation))
+
+    def move_axis(self, axis: MountAxis, rate: float):
+        def command():
+            self._slew_target = None
+            self._target_rate[axis.value] = np.clip(rate, -self.max_rate, self.max_rate)
+        self._send(command, slew=False)
+
+    def slew_to_altaz(self, azimuth: float, elevation: float):
+        def command():
+            self._slew_target = np.array([azimuth % 360, np.clip(elevation, *self.elevation_limits)])
+        self._send(command, slew=True)
+
+    def abort(self):
+        def command():
+            self._slew_target = None
+            self._target_rate[:] = 0
+        self._send(command, slew=False)
+
+    def _check_connected(self):
+        if not self._connected:
+            raise ValueError("Mount not connected. Call connect() first.")
+
+    def _send(self, command, slew):
+        self._check_connected()
+        now = self.clock()
+        self._advance(now)
+        heapq.heappush(self._pending, (now + self.command_latency, next(self._sequence), slew, command))
+
+    def _advance(self, now):
+        # Commands take effect in order at their arrival time, the axes are integrated between them
+        while self._pending and self._pending[0][0] <= now:
+            apply_time, _, _, command = heapq.heappop(self._pending)
+            self._integrate(apply_time)
+            command()
+        self._integrate(now)
+
+    def _integrate(self, until):
+        while until > self._time:
+            if self._slew_target is None:
+                dt = until - self._time
+            else:
+                dt = min(SLEW_STEP, until - self._time)
+                self._target_rate = self._slew_rates()
+            self._position, self._velocity = _ramp(self._position, self._velocity, self._target_rate, self.max_acceleration, dt)
+            self._time += dt
+            self._apply_limits()
+            if self._slew_target is not None:
+                self._settle_slew()
+
+    def _slew_error(self):
+        error = self._slew_target - self._position
+        error[0] = (error[0] + 180) % 360 - 180  # Shortest way round in azimuth
+        return error
+
+    def _slew_rates(self):
+        # Fastest rate from which the axis can still stop on the target at the acceleration limit
+        error = self._slew_error()
+        return np.sign(error) * np.minimum(self.max_rate, np.sqrt(2 * self.max_acceleration * np.abs(error)))
+
+    def _settle_slew(self):
+        # An axis that would reach or pass its target within the next step stops on it, otherwise the
+        # stepped braking profile keeps hunting around the target and the slew never ends
+        reach = np.abs(self._velocity) * SLEW_STEP + 0.5 * self.max_acceleration * SLEW_STEP**2
+        arrived = np.abs(self._slew_error()) <= reach
+        self._position[arrived] = self._slew_target[arrived]
+        self._velocity[arrived] = 0
+        self._target_rate[arrived] = 0
+        if np.all(arrived):
+            self._slew_target = None
+
+    def _apply_limits(self):
+        low, high = self.elevation_limits
+        if self._position[1] <= low or self._position[1] >= high:
+            self._position[1] = np.clip(self._position[1], low, high)
+            self._velocity[1] = 0
+            self._target_rate[1] = 0
+        self._position[0] %= 360
+
+
+def _ramp(position, velocity, target, acceleration, dt):
+    """Integrate constant-acceleration ramps from ``velocity`` to ``target`` for ``dt`` seconds, per axis."""
+    delta = target - velocity
+    ramp_time = np.minimum(np.abs(delta) / acceleration, dt)
+    signed_acceleration = np.sign(delta) * acceleration
+    new_velocity = velocity + signed_acceleration * ramp_time
+    new_position = (
+        position + velocity * ramp_time + 0.5 * signed_acceleration * ramp_time**2 +
+        new_velocity * (dt - ramp_time)
+    )
+    return new_position, new_velocity
@@ -0,0 +1,41 @@
+import numpy as np
+from sgp4.api import SatrecArray
+
+from ciclopscontroller.ephemeris.frames import EarthRotation, sgp4_dates
+
+
+class Catalog:
+    def __init__(self, satellites):
+        """
+        Batched SGP4 propagation of a list of skyfield ``EarthSatellite`` objects.
+
+        All satellites are propagated over a shared time grid in a single call to
+        ``sgp4.api.SatrecArray``, so the cost of a catalog is dominated by the C
+        propagator rather than a Python loop over objects.
+        """
+        self.satellites = list(satellites)
+        self.names = [satellite.name for satellite in self.satellites]
+        self._satrec_array = SatrecArray([satellite.model for satellite in self.satellites])
+
+    def __len__(self):
+        return len(self.satellites)
+
+    def propagate_teme(self, times):
+        """Return TEME positions (km) and velocities (km/s), each of shape (n_sats, n_times, 3)."""
+        jd, fraction = sgp4_dates(times)
+        errors, positions, velocities = self._satrec_array.sgp4(jd, fraction)
+
+        # Decayed or otherwise failed objects are reported as NaN rather than garbage
+        failed = errors != 0
+        positions[failed] = np.nan
+        velocities[failed] = np.nan
+        return positions, velocities
+
+    def propagate_itrs(self, times, rotation=None):
+        """
+        Return ITRS positions (km) and velocities (km/s), each of shape (n_sats, n_times, 3). Pass an
+        EarthRotation built for ``times`` to reuse it across calls on the same grid.
+        """
+        positions, velocities = self.propagate_teme(times)
+        rotation = rotation or EarthRotation.at(times)
+        return rotation.teme_to_itrs(positions, velocities)
@@ -0,0 +1,90 @@
+import numpy as np
+from numpy.polynomial import chebyshev
+
+
+class ChebyshevEphemeris:
+    def __init__(self, start, coefficients, segment_duration):
+        """
+        ==================  =================================================================================
+        **Arguments:**
+        start               Start of the first segment in seconds since epoch
+        coefficients        Array of shape (n_sats, n_segments, degree + 1, 3) of ITRS Chebyshev coefficients
+        segment_duration    Length of every segment in seconds
+        ==================  =================================================================================
+
+        SPK-style compact ephemeris: every object's trajectory is stored as a run of equal-length segments,
+        each a Chebyshev series per axis. Use ChebyshevEphemeris.fit() to build one from a Catalog.
+        """
+        self.start = float(start)
+        self.segment_duration = float(segment_duration)
+        self.coefficients = coefficients
+        # Velocity series are cheap to derive once, d/dt = d/dx * 2 / segment_duration
+        self.rate_coefficients = chebyshev.chebder(coefficients, axis=2) * 2 / self.segment_duration
+
+    @classmethod
+    def fit(cls, catalog, epoch_time, start, end, segment_duration=1200.0, degree=12):
+        """
+        Fit segments covering ``[start, end]`` seconds after the skyfield time ``epoch_time``, propagating
+        the whole catalog once at the Chebyshev nodes of every segment.
+        """
+        n_segments = max(1, int(np.ceil((end - start) / segment_duration)))
+        n_nodes = degree + 1
+
+        node_angles = np.pi * (np.arange(n_nodes) + 0.5) / n_nodes
+        nodes = np.cos(node_angles)
+        segment_starts = start + segment_duration * np.arange(n_segments)
+        node_dts = segment_starts[:, None] + (nodes[None, :] + 1) * segment_duration / 2
+
+        positions, _ = catalog.propagate_itrs(epoch_time + node_dts.ravel() / 86400)
+        positions = positions.reshape(len(catalog), n_segments, n_nodes, 3)
+
+        # Discrete Chebyshev transform of the node values
+        basis = np.cos(np.outer(np.arange(n_nodes), node_angles)) * 2 / n_nodes
+        basis[0] /= 2
+        coefficients = np.einsum('kj,snjc->snkc', basis, positions)
+        return cls(start, coefficients, segment_duration)
+
+    @property
+    def end(self):
+        return self.start + self.coefficients.shape[1] * self.segment_duration
+
+    def covers(self, times):
+        times = np.atleast_1d(times)
+        return times.min() >= self.start and times.max() <= self.end
+
+    def evaluate(self, times, indices=None, derivative=False):
+        """
+        Return ITRS positions (km) or, with ``derivative``, velocities (km/s) at seconds-since-epoch
+        ``times``, of shape (n_selected, n_times, 3). ``indices`` selects catalog objects, default all.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        if not self.covers(times):
+            raise ValueError(f"Times outside the fitted Chebyshev range [{self.start}, {self.end}] s.")
+
+        coefficients = self.rate_coefficients if derivative else self.coefficients
+        if indices is None:
+            indices = slice(None)
+
+        n_segments = coefficients.shape[1]
+        segment = np.clip(((times - self.start) // self.segment_duration).astype(int), 0, n_segments - 1)
+        x = 2 * (times - self.start - segment * self.segment_duration) / self.segment_duration - 1
+
+        # T_k(x) for every time at once
+        n_terms = coefficients.shape[2]
+        basis = np.empty((len(times), n_terms))
+        basis[:, 0] = 1
+        if n_terms > 1:
+            basis[:, 1] = x
+        for k in range(2, n_terms):
+            basis[:, k] = 2 * x * basis[:, k - 1] - basis[:, k - 2]
+
+        # One contraction per segment, so no temporary larger than a single segment's coefficients
+        n_selected = len(np.arange(coefficients.shape[0])[indices])
+        result = np.empty((n_selected, len(times), 3))
+        for index in np.unique(segment):
+            in_segment = np.nonzero(segment == index)[0]
+            result[:, in_segment] = np.einsum('skc,tk->stc', coefficients[indices, index], basis[in_segment])
+        return result
+
+    def nbytes(self):
+        return self.coefficients.nbytes
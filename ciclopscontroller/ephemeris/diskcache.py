@@ -0,0 +1,143 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+from sgp4.exporter import export_tle
+
+
+def tle_lines(satellites):
+    """Return the TLE lines of skyfield ``EarthSatellite`` objects, used to key cached propagation results."""
+    lines = []
+    for satellite in satellites:
+        lines.extend(export_tle(satellite.model))
+    return lines
+
+
+class DiskCache:
+    def __init__(self, directory='cache/ephemeris', max_bytes=2 * 1024**3, max_age=7 * 86400):
+        """
+        ==============  =======================================================================================
+        **Arguments:**
+        directory       Where entries are stored, one sub-directory of ``.npy`` files per key
+        max_bytes       Total size above which the least recently used entries are evicted
+        max_age         Entries not used for this many seconds are evicted
+        ==============  =======================================================================================
+
+        Entries are loaded back as read-only memory maps, so only the pages actually touched are read, but
+        a load still costs a few file opens. Only cache results that are expensive to recompute, like a whole
+        catalog fit, not small per-tick items. Disk errors only ever cost a cache miss: if the directory
+        cannot be created the cache is disabled and callers just compute everything.
+
+        The directory is scanned once here, after that eviction works from an in-memory index of entry
+        sizes and last use times, so saves never list the directory.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._index = {}  # Entry path to (last used, size in bytes)
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.enabled = True
+        except OSError as e:
+            print(f"Disk cache disabled, cannot create {self.directory}: {e}")
+            self.enabled = False
+            return
+        self._scan()
+        self.evict()
+
+    @staticmethod
+    def make_key(**parts):
+        digest = hashlib.sha256()
+        for name in sorted(parts):
+            value = parts[name]
+            if isinstance(value, (list, tuple)):
+                value = '\n'.join(str(item) for item in value)
+            digest.update(f'{name}={value};'.encode())
+        return digest.hexdigest()
+
+    def load(self, key):
+        if not self.enabled:
+            return None
+        entry = os.path.join(self.directory, key)
+        if not os.path.isdir(entry):
+            return None
+        try:
+            arrays = {
+                filename[:-4]: np.load(os.path.join(entry, filename), mmap_mode='r')
+                for filename in os.listdir(entry) if filename.endswith('.npy')
+            }
+        except (OSError, ValueError):
+            # Half-deleted or corrupt entry, treat it as a miss and let it be rewritten
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        try:
+            os.utime(entry)  # Mark as recently used for eviction by the next run's scan
+        except OSError:
+            pass  # Evicted by another thread since, the arrays are already mapped and stay valid
+        with self._lock:
+            if entry in self._index:
+                self._index[entry] = (time.time(), self._index[entry][1])
+        return arrays
+
+    def save(self, key, arrays):
+        if not self.enabled:
+            return
+        entry = os.path.join(self.directory, key)
+        if os.path.isdir(entry):
+            return
+
+        # Write into a private directory then rename, so readers never see a partial entry
+        staging = os.path.join(self.directory, f'.{key}.{uuid.uuid4().hex}')
+        try:
+            os.makedirs(staging)
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, f'{name}.npy'), np.ascontiguousarray(array))
+            size = sum(file.stat().st_size for file in os.scandir(staging))
+            os.rename(staging, entry)
+        except OSError:
+            # Disk full or read-only, or another thread or process saved the same key first. Either way the
+            # caller already has the arrays, so it is only a missed cache write
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._index[entry] = (time.time(), size)
+        self.evict()
+
+    def evict(self):
+        """Remove entries unused for ``max_age``, then least recently used ones until under ``max_bytes``."""
+        now = time.time()
+        with self._lock:
+            entries = sorted((last_used, size, path) for path, (last_used, size) in self._index.items())
+            total = sum(size for _, size, _ in entries)
+            evicted = []
+            for last_used, size, path in entries:
+                if now - last_used <= self.max_age and total <= self.max_bytes:
+                    break
+                del self._index[path]
+                evicted.append(path)
+                total -= size
+        for path in evicted:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _scan(self):
+        # Entries written by earlier runs, indexed by the mtime load() sets on every hit
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            try:
+                last_used = os.stat(path).st_mtime
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+            except OSError:
+                continue
+            self._index[path] = (last_used, size)
@@ -0,0 +1,189 @@
+import threading
+
+import numpy as np
+
+
+class EphemerisCache:
+    def __init__(self, compute_chunk, chunk_duration=300.0, samples_per_chunk=30, max_chunks=24, lookahead=2, lookbehind=1):
+        """
+        ==================  =================================================================================
+        **Arguments:**
+        compute_chunk       Callable taking an array of seconds since epoch and returning a dict mapping
+                            each key (e.g. a PositionFrame) to a tuple of (n_times, k) arrays
+                            ``(values, rates)``, rates being the time derivative per second
+        chunk_duration      Length of a single chunk in seconds
+        samples_per_chunk   Number of sample intervals in a chunk
+        max_chunks          Upper bound on the number of chunks held in memory
+        lookahead           Chunks kept computed ahead of the playhead by advance()
+        lookbehind          Chunks kept behind the playhead by advance()
+        ==================  =================================================================================
+
+        Values are interpolated with cubic Hermite splines using the stored rates, so far fewer samples are
+        needed than with linear interpolation. Keys should hold smooth Cartesian quantities, angles that
+        wrap or swing fast near zenith are better derived from interpolated vectors.
+
+        Chunk ``k`` covers ``[k * chunk_duration, (k + 1) * chunk_duration]`` and the held chunks always
+        form a contiguous run, so lookups are a single ``searchsorted`` over the concatenated sample times.
+        Readers never take the lock: they grab the current ``(dts, data)`` snapshot, which is replaced
+        atomically whenever the chunk set changes. Chunks are computed outside the lock, which is only held to
+        splice them into the run, so a lookup is never stuck behind another thread's propagation.
+
+        The run belongs to the playhead: advance() and ensure() move it, lookups only grow it when it stays
+        within ``max_chunks``. A lookup far from the run (a pass prediction, a sky chart at another time) is
+        served from a separate one-off snapshot instead, so it never evicts the chunks the live view needs.
+
+        Setting ``frozen`` stops the cache from computing anything more once it holds chunks, lookups
+        outside the held run are clamped to its ends instead. Used for a cache that is about to be replaced.
+        """
+        self.compute_chunk = compute_chunk
+        self.chunk_duration = float(chunk_duration)
+        self.samples_per_chunk = int(samples_per_chunk)
+        self.max_chunks = int(max_chunks)
+        self.lookahead = int(lookahead)
+        self.lookbehind = int(lookbehind)
+
+        self.frozen = False
+        self._chunks = {}
+        self._snapshot = None
+        self._side_snapshot = None  # Last one-off lookup away from the run
+        self._generation = 0        # Bumped by clear(), chunks computed before it are never spliced in
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._chunks = {}
+            self._snapshot = None
+            self._side_snapshot = None
+            self._generation += 1
+
+    def coverage(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        dts = snapshot[0]
+        return dts[0], dts[-1]
+
+    def advance(self, playhead):
+        """Extend the cache ahead of the playhead and drop chunks that have fallen behind it."""
+        self.ensure(
+            playhead - self.lookbehind * self.chunk_duration,
+            playhead + self.lookahead * self.chunk_duration
+        )
+
+    def ensure(self, start, end):
+        """
+        Make sure ``[start, end]`` (seconds since epoch) is covered by the run, computing missing chunks, and
+        return the snapshot covering it.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and (self.frozen or (start >= snapshot[0][0] and end <= snapshot[0][-1])):
+            return snapshot
+        first, last = self._chunk_range(start, end)
+
+        generation = self._generation
+        chunks = self._chunks  # Never mutated once published, safe to read without the lock
+        held = sorted(chunks)
+        if held and (first > held[-1] + 1 or last < held[0] - 1):
+            # Jumped away from the held run (slider scrub, epoch change), start a new run
+            chunks = {}
+        lower = min([first] + list(chunks))
+        upper = max([last] + list(chunks))
+        computed = {index: self._compute(index) for index in range(lower, upper + 1) if index not in chunks}
+
+        with self._lock:
+            stale = generation != self._generation
+            if not stale:
+                # Another thread may have moved the run while these were computed, keep its chunks if they join up
+                merged = {**self._chunks, **chunks, **computed}
+                if max(merged) - min(merged) + 1 != len(merged):
+                    merged = {**chunks, **computed}
+
+                # Bound memory by dropping whichever end lies furthest outside the requested range
+                while len(merged) > max(self.max_chunks, last - first + 1):
+                    low, high = min(merged), max(merged)
+                    if first - low >= high - last:
+                        del merged[low]
+                    else:
+                        del merged[high]
+
+                snapshot = self._concatenate(merged)
+                self._chunks = merged
+                self._snapshot = snapshot
+        if stale:
+            return self.ensure(start, end)  # Cleared meanwhile, e.g. for a new satellite, start over
+        return snapshot
+
+    def interpolate(self, times, key, derivative=False):
+        """Hermite-interpolate ``key`` at seconds-since-epoch ``times``, or its time derivative with ``derivative``."""
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        snapshot = self._snapshot
+        if snapshot is None or times.min() < snapshot[0][0] or times.max() > snapshot[0][-1]:
+            snapshot = self._lookup_snapshot(times.min(), times.max())
+
+        dts, data = snapshot
+        values, rates = data[key]
+        if self.frozen:
+            times = np.clip(times, dts[0], dts[-1])
+
+        upper_idx = np.searchsorted(dts, times, side='right')
+        upper_idx = np.clip(upper_idx, 1, len(dts) - 1)
+        lower_idx = upper_idx - 1
+
+        step = (dts[upper_idx] - dts[lower_idx])[:, None]
+        s = (times[:, None] - dts[lower_idx][:, None]) / step
+        s2 = s * s
+        s3 = s2 * s
+
+        if derivative:
+            return (
+                (6 * s2 - 6 * s) / step * values[lower_idx] +
+                (3 * s2 - 4 * s + 1) * rates[lower_idx] +
+                (-6 * s2 + 6 * s) / step * values[upper_idx] +
+                (3 * s2 - 2 * s) * rates[upper_idx]
+            )
+        return (
+            (2 * s3 - 3 * s2 + 1) * values[lower_idx] +
+            (s3 - 2 * s2 + s) * step * rates[lower_idx] +
+            (-2 * s3 + 3 * s2) * values[upper_idx] +
+            (s3 - s2) * step * rates[upper_idx]
+        )
+
+    def _lookup_snapshot(self, start, end):
+        # Snapshot for a lookup the run doesn't cover
+        snapshot = self._snapshot
+        if snapshot is None or self.frozen:
+            return self.ensure(start, end)  # Frozen caches don't grow, the lookup is clamped to the run
+
+        first, last = self._chunk_range(start, end)
+        held_first, held_last = self._chunk_range(snapshot[0][0], snapshot[0][-1] - self.chunk_duration)
+        if first >= held_first - 1 and last <= held_last + 1 and \
+                max(last, held_last) - min(first, held_first) + 1 <= self.max_chunks:
+            # Next to the run and fits without dropping anything, e.g. a trail reaching past the lookahead
+            return self.ensure(start, end)
+
+        side_snapshot = self._side_snapshot
+        if side_snapshot is None or start < side_snapshot[0][0] or end > side_snapshot[0][-1]:
+            side_snapshot = self._concatenate({index: self._compute(index) for index in range(first, last + 1)})
+            self._side_snapshot = side_snapshot
+        return side_snapshot
+
+    def _chunk_range(self, start, end):
+        return int(np.floor(start / self.chunk_duration)), int(np.floor(end / self.chunk_duration))
+
+    def _compute(self, index):
+        start = index * self.chunk_duration
+        dts = np.linspace(start, start + self.chunk_duration, self.samples_per_chunk + 1)
+        return dts, self.compute_chunk(dts)
+
+    def _concatenate(self, chunks):
+        # Neighbouring chunks share their boundary sample, keep it only once
+        ordered = [chunks[index] for index in sorted(chunks)]
+        dts = np.concatenate([ordered[0][0]] + [chunk_dts[1:] for chunk_dts, _ in ordered[1:]])
+        data = {
+            key: tuple(
+                np.concatenate([ordered[0][1][key][i]] + [chunk_data[key][i][1:] for _, chunk_data in ordered[1:]])
+                for i in range(2)
+            )
+            for key in ordered[0][1]
+        }
+        return dts, data
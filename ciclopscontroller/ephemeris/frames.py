@@ -0,0 +1,145 @@
+from enum import Enum
+
+import numpy as np
+from skyfield.sgp4lib import theta_GMST1982
+
+DAY_S = 86400.0
+
+# WGS84 ellipsoid
+EQUATORIAL_RADIUS = 6378.137  # km
+FLATTENING = 1 / 298.257223563
+
+
+class PositionFrame(Enum):
+    ITRS = 'itrs'
+    TOPO = 'topo'
+    ALTAZ = 'altaz'
+    ALTAZ_RATE = 'altaz_rate'  # [alt_rate, az_rate] in rad/s and range_rate in km/s
+
+
+def sgp4_dates(times):
+    """Split skyfield times into the UTC (jd, fraction) pair SGP4 expects."""
+    jd = np.atleast_1d(times.whole)
+    # Same conversion as EarthSatellite._position_and_velocity_TEME_km
+    fraction = np.atleast_1d(times.tai_fraction - times._leap_seconds() / DAY_S)
+    return jd, fraction
+
+
+class EarthRotation:
+    def __init__(self, theta, omega):
+        """
+        TEME to ITRS rotation for a whole time grid, built once and reused for every object propagated on
+        that grid. ``theta`` is the GMST 1982 angle (rad) per time and ``omega`` its rate (rad/s).
+        """
+        self.theta = np.atleast_1d(theta)
+        self.omega = np.atleast_1d(omega)
+        self.cos_theta = np.cos(self.theta)
+        self.sin_theta = np.sin(self.theta)
+
+    @classmethod
+    def at(cls, times):
+        theta, theta_dot = theta_GMST1982(np.atleast_1d(times.whole), np.atleast_1d(times.ut1_fraction))
+        return cls(theta, theta_dot / DAY_S)
+
+    @property
+    def matrices(self):
+        """Rotation matrices of shape (n_times, 3, 3) taking TEME vectors to ITRS."""
+        matrices = np.zeros((len(self.theta), 3, 3))
+        matrices[:, 0, 0] = self.cos_theta
+        matrices[:, 0, 1] = self.sin_theta
+        matrices[:, 1, 0] = -self.sin_theta
+        matrices[:, 1, 1] = self.cos_theta
+        matrices[:, 2, 2] = 1
+        return matrices
+
+    def teme_to_itrs(self, positions, velocities):
+        """Rotate (..., n_times, 3) TEME positions (km) and velocities (km/s) into ITRS."""
+        x, y, z = positions[..., 0], positions[..., 1], positions[..., 2]
+        vx, vy, vz = velocities[..., 0], velocities[..., 1], velocities[..., 2]
+
+        x_itrs = self.cos_theta * x + self.sin_theta * y
+        y_itrs = -self.sin_theta * x + self.cos_theta * y
+        vx_itrs = self.cos_theta * vx + self.sin_theta * vy + self.omega * y_itrs
+        vy_itrs = -self.sin_theta * vx + self.cos_theta * vy - self.omega * x_itrs
+
+        return (
+            np.stack([x_itrs, y_itrs, z], axis=-1),
+            np.stack([vx_itrs, vy_itrs, vz], axis=-1)
+        )
+
+
+class Observer:
+    def __init__(self, latitude, longitude, elevation=0.0):
+        """
+        Fixed ground site at geodetic ``latitude`` and ``longitude`` (degrees) and ``elevation`` (m) on
+        WGS84. The ITRS position and the ITRS to East, North, Up rotation are computed once, so every
+        conversion below is a single matrix product over (..., 3) arrays.
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.elevation = elevation
+
+        lat = np.radians(latitude)
+        lon = np.radians(longitude)
+        e2 = FLATTENING * (2 - FLATTENING)
+        normal_radius = EQUATORIAL_RADIUS / np.sqrt(1 - e2 * np.sin(lat)**2)
+        height = elevation / 1000
+        self.itrs = np.array([
+            (normal_radius + height) * np.cos(lat) * np.cos(lon),
+            (normal_radius + height) * np.cos(lat) * np.sin(lon),
+            (normal_radius * (1 - e2) + height) * np.sin(lat)
+        ])
+        self.enu_rotation = np.array([
+            [-np.sin(lon), np.cos(lon), 0],
+            [-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)],
+            [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)]
+        ])
+
+    def itrs_to_topo(self, positions, velocities=None):
+        topo = (positions - self.itrs) @ self.enu_rotation.T
+        if velocities is None:
+            return topo
+        # The site is fixed in ITRS so velocities only need rotating
+        return topo, velocities @ self.enu_rotation.T
+
+    def topo_to_itrs(self, topo):
+        return self.itrs + topo @ self.enu_rotation
+
+    def convert(self, itrs_positions, frame: PositionFrame):
+        """Convert (..., 3) ITRS positions into ``frame``, ALTAZ gives (..., 2) [alt, az] in radians."""
+        if frame == PositionFrame.ITRS:
+            return itrs_positions
+        if frame == PositionFrame.ALTAZ_RATE:
+            raise ValueError("ALTAZ_RATE needs velocities, use convert_rates().")
+        topo = self.itrs_to_topo(itrs_positions)
+        if frame == PositionFrame.TOPO:
+            return topo
+        return topo_to_altaz(topo)
+
+    def convert_rates(self, itrs_positions, itrs_velocities):
+        """(..., 3) [alt_rate, az_rate, range_rate] from ITRS positions (km) and velocities (km/s)."""
+        return altaz_rates(*self.itrs_to_topo(itrs_positions, itrs_velocities))
+
+
+def topo_to_altaz(topo_positions):
+    """Convert (..., 3) East, North, Up vectors into (..., 2) [alt, az] in radians, az in [0, 2pi)."""
+    east, north, up = topo_positions[..., 0], topo_positions[..., 1], topo_positions[..., 2]
+    alt = np.arctan2(up, np.hypot(east, north))
+    az = np.mod(np.arctan2(east, north), 2 * np.pi)
+    return np.stack([alt, az], axis=-1)
+
+
+def altaz_rates(topo_positions, topo_velocities):
+    """
+    Analytic elevation and azimuth rates (rad/s) and range rate (km/s) of (..., 3) East, North, Up
+    positions and velocities, as (..., 3). Exact for the given velocity, unlike differencing sampled
+    angles, but the azimuth rate is unbounded straight overhead.
+    """
+    east, north, up = topo_positions[..., 0], topo_positions[..., 1], topo_positions[..., 2]
+    v_east, v_north, v_up = topo_velocities[..., 0], topo_velocities[..., 1], topo_velocities[..., 2]
+    horizontal_sq = east**2 + north**2
+    horizontal = np.sqrt(horizontal_sq)
+    alt_rate = (horizontal_sq * v_up - up * (east * v_east + north * v_north)) / (horizontal * (horizontal_sq + up**2))
+    az_rate = (north * v_east - east * v_north) / horizontal_sq
+    range_rate = (east * v_east + north * v_north + up * v_up) / np.sqrt(horizontal_sq + up**2)
+    return np.stack([alt_rate, az_rate, range_rate], axis=-1)
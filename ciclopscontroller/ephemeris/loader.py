@@ -0,0 +1,32 @@
+import threading
+
+import skyfield.api as sf
+
+_lock = threading.Lock()
+_timescale = None
+_ephemerides = {}
+
+
+def get_timescale():
+    """Process-wide skyfield timescale, loaded on first use."""
+    global _timescale
+    if _timescale is None:
+        with _lock:
+            if _timescale is None:
+                _timescale = sf.load.timescale()
+    return _timescale
+
+
+def get_ephemeris(filename='de421.bsp'):
+    """
+    Process-wide planetary ephemeris, loaded on first use. Skyfield opens SPK kernels through jplephem,
+    which memory-maps the segments, so sharing one kernel also shares its pages between every user.
+    """
+    ephemeris = _ephemerides.get(filename)
+    if ephemeris is None:
+        with _lock:
+            ephemeris = _ephemerides.get(filename)
+            if ephemeris is None:
+                ephemeris = sf.load(filename)
+                _ephemerides[filename] = ephemeris
+    return ephemeris
@@ -0,0 +1,227 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+from sgp4.exporter import export_tle
+
+from ciclopscontroller.ephemeris.frames import DAY_S, EarthRotation, sgp4_dates, altaz_rates
+
+PASS_DTYPE = np.dtype([
+    ('satellite', 'i4'),        # Index into the catalog
+    ('rise', 'f8'),             # Seconds since epoch
+    ('culmination', 'f8'),
+    ('set', 'f8'),
+    ('max_elevation', 'f8'),    # Radians
+    ('duration', 'f8'),         # Seconds
+    ('visible_duration', 'f8'), # Seconds the pass is observable, equals duration without a visibility filter
+])
+
+VISIBILITY_SAMPLES = 16
+MAX_NEWTON_STEPS = 4  # Direct SGP4 refinement steps per event, two normally suffice
+
+
+class PassPredictor:
+    def __init__(self, catalog, observer, min_elevation=0.0, step=60.0, tolerance=0.01, chunk_size=500,
+                 visibility=None, sun_positions=None):
+        """
+        ==============  =======================================================================================
+        **Arguments:**
+        catalog         Catalog of the satellites to screen
+        observer        frames.Observer the passes are predicted for
+        min_elevation   Elevation (rad) above which the satellite counts as up
+        step            Spacing in seconds of the coarse screening grid
+        tolerance       Accuracy in seconds of the refined rise, culmination and set times
+        chunk_size      Number of satellites propagated together, bounds memory per worker
+        visibility      Optional VisibilityFilter, used to fill in the observable part of each pass
+        sun_positions   Callable returning (n_times, 3) Sun ITRS km at seconds since epoch, needed with
+                        ``visibility``
+        ==============  =======================================================================================
+
+        The catalog is propagated once on the coarse grid with positions and velocities. Rise, culmination
+        and set are then bracketed by sign changes of elevation and elevation rate and refined by bisection
+        on the cubic Hermite interpolant of each bracketing interval. The interpolant alone is only good to a
+        few hundredths of a second on a 60 s grid, so each time is then polished by Newton steps on direct
+        SGP4 evaluations of that one satellite until the step drops below ``tolerance``.
+        Passes already in progress at the start, or still up at the end, are clipped to the window.
+        """
+        self.catalog = catalog
+        self.observer = observer
+        self.min_elevation = min_elevation
+        self.step = step
+        self.tolerance = tolerance
+        self.chunk_size = chunk_size
+        self.visibility = visibility
+        self.sun_positions = sun_positions
+
+    def predict(self, epoch_time, start, end, processes=1):
+        """
+        Find every pass in ``[start, end]`` seconds after the skyfield time ``epoch_time`` and return them
+        as a structured array of PASS_DTYPE sorted by rise time. ``processes`` > 1 spreads chunks of the
+        catalog over a process pool, ``None`` uses every core.
+        """
+        n_steps = max(1, int(np.ceil((end - start) / self.step)))
+        dts = np.linspace(start, end, n_steps + 1)
+        times = epoch_time + dts / 86400
+        jd, fraction = sgp4_dates(times)
+        rotation = EarthRotation.at(times)
+        iterations = max(1, int(np.ceil(np.log2(self.step / self.tolerance))))
+        sun_itrs = self.sun_positions(dts) if self.visibility is not None else None
+
+        tle_pairs = [export_tle(satellite.model) for satellite in self.catalog.satellites]
+        jobs = [
+            (tle_pairs[offset:offset + self.chunk_size], offset, jd, fraction, rotation, dts,
+             self.observer, self.min_elevation, iterations, self.tolerance, self.visibility, sun_itrs)
+            for offset in range(0, len(tle_pairs), self.chunk_size)
+        ]
+
+        if processes == 1:
+            results = [_find_passes(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as executor:
+                results = list(executor.map(_find_passes, *zip(*jobs)))
+
+        passes = np.concatenate(results) if results else np.empty(0, dtype=PASS_DTYPE)
+        return passes[np.argsort(passes['rise'], kind='stable')]
+
+
+def _find_passes(tle_pairs, offset, jd, fraction, rotation, dts, observer, min_elevation, iterations, tolerance,
+                 visibility, sun_itrs):
+    # Module level so it can be pickled into worker processes, satellites travel as TLE lines
+    satrec_list = [Satrec.twoline2rv(line1, line2) for line1, line2 in tle_pairs]
+    satrecs = SatrecArray(satrec_list)
+    errors, positions, velocities = satrecs.sgp4(jd, fraction)
+    positions[errors != 0] = np.nan
+    velocities[errors != 0] = np.nan
+    positions, velocities = rotation.teme_to_itrs(positions, velocities)
+    topo, topo_rates = observer.itrs_to_topo(positions, velocities)
+
+    elevation, elevation_rate = _elevation_and_rate(topo, topo_rates)
+    above = elevation > min_elevation
+    rising = elevation_rate > 0
+
+    def hermite_topo(sat, interval, t):
+        step = (dts[interval + 1] - dts[interval])[:, None]
+        s = (t - dts[interval])[:, None] / step
+        s2 = s * s
+        s3 = s2 * s
+        p0, p1 = topo[sat, interval], topo[sat, interval + 1]
+        m0, m1 = topo_rates[sat, interval] * step, topo_rates[sat, interval + 1] * step
+        position = (2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * m0 + (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * m1
+        rate = ((6 * s2 - 6 * s) * p0 + (3 * s2 - 4 * s + 1) * m0 + (-6 * s2 + 6 * s) * p1 + (3 * s2 - 2 * s) * m1) / step
+        return position, rate
+
+    def hermite_elevation(sat, interval, t):
+        return _elevation_and_rate(*hermite_topo(sat, interval, t))
+
+    def sgp4_elevation(sat, interval, t):
+        # Direct propagation of each event's own satellite at its own time, one sgp4_array() call per satellite
+        t_jd, t_fraction = jd[interval], fraction[interval] + (t - dts[interval]) / DAY_S
+        positions = np.full((len(t), 3), np.nan)
+        velocities = np.full((len(t), 3), np.nan)
+        for satellite in np.unique(sat):
+            events = np.nonzero(sat == satellite)[0]
+            errors, p, v = satrec_list[satellite].sgp4_array(t_jd[events], t_fraction[events])
+            ok = errors == 0
+            positions[events[ok]], velocities[events[ok]] = p[ok], v[ok]
+        # GMST is linear to far below a microradian across one grid interval
+        theta = rotation.theta[interval] + rotation.omega[interval] * (t - dts[interval])
+        positions, velocities = EarthRotation(theta, rotation.omega[interval]).teme_to_itrs(positions, velocities)
+        return _elevation_and_rate(*observer.itrs_to_topo(positions, velocities))
+
+    def refine(sat, interval, lo, hi, use_rate):
+        # Vectorised bisection over every bracket at once
+        def f(t):
+            elevation, rate = hermite_elevation(sat, interval, t)
+            return rate if use_rate else elevation - min_elevation
+        bracket = lo, hi
+        f_lo = f(lo)
+        for _ in range(iterations):
+            mid = (lo + hi) / 2
+            f_mid = f(mid)
+            same_side = np.sign(f_mid) == np.sign(f_lo)
+            lo = np.where(same_side, mid, lo)
+            f_lo = np.where(same_side, f_mid, f_lo)
+            hi = np.where(same_side, hi, mid)
+        t = (lo + hi) / 2
+
+        # Newton on the real orbit. Elevation's derivative comes with it, the rate's is a finite difference
+        for _ in range(MAX_NEWTON_STEPS):
+            elevation, rate = sgp4_elevation(sat, interval, t)
+            if use_rate:
+                _, rate_later = sgp4_elevation(sat, interval, t + tolerance)
+                step = rate * tolerance / (rate_later - rate)
+            else:
+                step = (elevation - min_elevation) / rate
+            step = np.where(np.isfinite(step), step, 0)  # Propagation failed, keep the interpolated time
+            t = np.clip(t - step, *bracket)
+            if np.all(np.abs(step) < tolerance):
+                break
+        return t
+
+    def brackets(mask):
+        sat, interval = np.nonzero(mask)
+        return sat, interval, dts[interval], dts[interval + 1]
+
+    rise_sat, rise_interval, lo, hi = brackets(~above[:, :-1] & above[:, 1:])
+    rise_times = refine(rise_sat, rise_interval, lo, hi, use_rate=False)
+    set_sat, set_interval, lo, hi = brackets(above[:, :-1] & ~above[:, 1:])
+    set_times = refine(set_sat, set_interval, lo, hi, use_rate=False)
+    culm_sat, culm_interval, lo, hi = brackets(rising[:, :-1] & ~rising[:, 1:])
+    culm_times = refine(culm_sat, culm_interval, lo, hi, use_rate=True)
+    culm_elevations, _ = sgp4_elevation(culm_sat, culm_interval, culm_times)
+
+    # Short passes can peak above the limit entirely between two grid samples
+    hidden = (culm_elevations > min_elevation) & ~above[culm_sat, culm_interval] & ~above[culm_sat, culm_interval + 1]
+    if np.any(hidden):
+        sat, interval, peak = culm_sat[hidden], culm_interval[hidden], culm_times[hidden]
+        rise_sat = np.concatenate([rise_sat, sat])
+        rise_times = np.concatenate([rise_times, refine(sat, interval, dts[interval], peak, use_rate=False)])
+        set_sat = np.concatenate([set_sat, sat])
+        set_times = np.concatenate([set_times, refine(sat, interval, peak, dts[interval + 1], use_rate=False)])
+
+    # Walk each satellite's events in time order: 0 rise, 1 culmination, 2 set
+    sats = np.concatenate([rise_sat, culm_sat, set_sat])
+    times = np.concatenate([rise_times, culm_times, set_times])
+    kinds = np.concatenate([np.zeros(len(rise_sat), int), np.ones(len(culm_sat), int), np.full(len(set_sat), 2)])
+    elevations = np.concatenate([np.full(len(rise_sat), np.nan), culm_elevations, np.full(len(set_sat), np.nan)])
+    order = np.lexsort((kinds, times, sats))
+
+    passes = []
+    current = {}
+    for sat in np.nonzero(above[:, 0])[0]:
+        current[sat] = [dts[0], dts[0], elevation[sat, 0]]
+    for index in order:
+        sat, t, kind = sats[index], times[index], kinds[index]
+        if kind == 0:
+            current[sat] = [t, np.nan, -np.inf]
+        elif sat in current:
+            state = current[sat]
+            if kind == 1 and elevations[index] > state[2]:
+                state[1], state[2] = t, elevations[index]
+            elif kind == 2:
+                passes.append((sat + offset, state[0], state[1], t, state[2], t - state[0], t - state[0]))
+                del current[sat]
+    for sat, state in current.items():
+        # Still up at the end of the window, the end point may be the highest point seen
+        if elevation[sat, -1] > state[2]:
+            state[1], state[2] = dts[-1], elevation[sat, -1]
+        passes.append((sat + offset, state[0], state[1], dts[-1], state[2], dts[-1] - state[0], dts[-1] - state[0]))
+
+    passes = np.array(passes, dtype=PASS_DTYPE)
+    if visibility is not None and len(passes):
+        # Sample each pass evenly and count the fraction of samples that are actually observable
+        sample_times = (passes['rise'][:, None] + np.linspace(0, 1, VISIBILITY_SAMPLES) * passes['duration'][:, None]).ravel()
+        sample_sats = np.repeat(passes['satellite'] - offset, VISIBILITY_SAMPLES)
+        interval = np.clip(np.searchsorted(dts, sample_times, side='right') - 1, 0, len(dts) - 2)
+        topo_samples, _ = hermite_topo(sample_sats, interval, sample_times)
+        sat_samples = observer.topo_to_itrs(topo_samples)
+        sun_samples = np.stack([np.interp(sample_times, dts, sun_itrs[:, axis]) for axis in range(3)], axis=-1)
+        observable = visibility.observable(sat_samples, sun_samples).reshape(len(passes), VISIBILITY_SAMPLES)
+        passes['visible_duration'] = observable.mean(axis=1) * passes['duration']
+    return passes
+
+
+def _elevation_and_rate(topo, topo_rates):
+    horizontal = np.hypot(topo[..., 0], topo[..., 1])
+    return np.arctan2(topo[..., 2], horizontal), altaz_rates(topo, topo_rates)[..., 0]
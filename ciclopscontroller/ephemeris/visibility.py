@@ -0,0 +1,62 @@
+import numpy as np
+
+from ciclopscontroller.ephemeris.frames import PositionFrame
+
+EARTH_RADIUS = 6378.137  # km, WGS84 equatorial
+
+
+class HorizonMask:
+    def __init__(self, azimuths, elevations):
+        """
+        Minimum usable elevation as a function of azimuth, linearly interpolated between the given
+        points and wrapping around north. Both arrays are in radians.
+        """
+        order = np.argsort(np.mod(azimuths, 2 * np.pi))
+        self.azimuths = np.mod(np.asarray(azimuths, dtype=float), 2 * np.pi)[order]
+        self.elevations = np.asarray(elevations, dtype=float)[order]
+
+    @classmethod
+    def flat(cls, elevation=0.0):
+        return cls([0.0], [elevation])
+
+    def min_elevation(self, azimuth):
+        return np.interp(np.mod(azimuth, 2 * np.pi), self.azimuths, self.elevations, period=2 * np.pi)
+
+
+class VisibilityFilter:
+    def __init__(self, observer, horizon_mask=None, darkness_limit=np.radians(-18)):
+        """
+        ==============  =======================================================================================
+        **Arguments:**
+        observer        frames.Observer of the site
+        horizon_mask    HorizonMask the satellite must be above, defaults to the flat horizon
+        darkness_limit  Sun elevation (rad) below which the site is dark, astronomical twilight by default
+        ==============  =======================================================================================
+
+        Every test broadcasts satellite vectors of shape (..., n_times, 3) against Sun vectors of shape
+        (n_times, 3), all in ITRS km, so whole (satellite x time) grids are filtered in one call.
+        """
+        self.observer = observer
+        self.horizon_mask = horizon_mask or HorizonMask.flat()
+        self.darkness_limit = darkness_limit
+
+    def sunlit(self, sat_itrs, sun_itrs):
+        """True where the satellite is outside Earth's (cylindrical) shadow."""
+        sun_hat = sun_itrs / np.linalg.norm(sun_itrs, axis=-1, keepdims=True)
+        along = np.sum(sat_itrs * sun_hat, axis=-1)
+        across_sq = np.sum(sat_itrs**2, axis=-1) - along**2
+        return (along > 0) | (across_sq > EARTH_RADIUS**2)
+
+    def sun_elevation(self, sun_itrs):
+        return self.observer.convert(sun_itrs, PositionFrame.ALTAZ)[..., 0]
+
+    def site_dark(self, sun_itrs):
+        return self.sun_elevation(sun_itrs) < self.darkness_limit
+
+    def above_horizon(self, sat_itrs):
+        altaz = self.observer.convert(sat_itrs, PositionFrame.ALTAZ)
+        return altaz[..., 0] > self.horizon_mask.min_elevation(altaz[..., 1])
+
+    def observable(self, sat_itrs, sun_itrs):
+        """True where the satellite is sunlit, above the horizon mask and the site is dark."""
+        return self.site_dark(sun_itrs) & self.sunlit(sat_itrs, sun_itrs) & self.above_horizon(sat_itrs)
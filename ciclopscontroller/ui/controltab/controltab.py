@@ -2,8 +2,10 @@ from PySide6.QtWidgets import QWidget
 import pyqtgraph as pg
 import pyqtgraph.opengl as gl
 from PySide6.QtWidgets import QVBoxLayout, QGridLayout, QGroupBox, QHBoxLayout, QLabel, QSlider, QPushButton, QDoubleSpinBox
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal, Slot
+from PySide6.QtGui import QShortcut, QKeySequence
 import numpy as np
+from time import perf_counter
 from ciclopscontroller.ui.controltab.orbitview import OrbitView
 from ciclopscontroller.ui.controltab.topoview import TopoView
 from ciclopscontroller.ui.controltab.skychartview import SkyChartView
@@ -11,11 +13,21 @@ from ciclopscontroller.ui.controltab.skychartview import SkyChartView
 from ciclopscontroller.controllers.mountcontroller import MountController
 from ciclopscontroller.controllers.satcontroller import SatController
 from ciclopscontroller.controllers.timecontroller import TimeController
+from ciclopscontroller.controllers.profiler import PROFILER, LatencyProbe
 
 from ciclopscontroller.ui.controltab.timecontrolbox import TimeControlBox
 from ciclopscontroller.ui.controltab.mountcontrolbox import MountControlBox
+from ciclopscontroller.ui.profileroverlay import ProfilerOverlay
+
+# Frame scheduling, all in ms
+MIN_FRAME_INTERVAL = 16     # Never faster than the display
+MAX_FRAME_INTERVAL = 200    # Never slower than this while the clock runs
+IDLE_FRAME_INTERVAL = 250   # Paused or hidden, only the real-time clock label needs refreshing
+FRAME_BUDGET = 0.5          # Fraction of the interval one frame may use, the rest is left to the event loop
 
 class ControlTab(QWidget):
+    snapshot_requested = Signal()
+
     def __init__(self, sat_controller, mount_controller, time_controller):
         super().__init__()
 
@@ -48,14 +60,98 @@ class ControlTab(QWidget):
         main_layout.addLayout(controls_box)
         self.setLayout(main_layout)
 
+        # SatController lives on its own thread, both connections are queued. Snapshots are computed
+        # there and only drawn here, so slow propagation delays frames instead of freezing the window
+        self._snapshot_pending = False
+        self.snapshot_requested.connect(self.sat_controller.publish_snapshot)
+        self.sat_controller.snapshot_ready.connect(self.on_snapshot_ready)
+        self.sat_controller.recompute_progress.connect(self.on_recompute_progress)
+
+        # The clock state last drawn, frames are only requested when it changed or the clock is running
+        self._drawn_state = None
+        self._requested_state = None
+        self._request_started = 0.0
+        self._frame_cost = 0.0       # Smoothed request-to-drawn time in ms
+        self._stale_views = set()    # Views that were hidden when the last snapshot arrived
+        self._retry_at = 0.0         # perf_counter() before which a request that came back empty isn't repeated
+        self._force_frame = True
+
+        self.profiler_overlay = ProfilerOverlay(self)
+        QShortcut(QKeySequence(Qt.Key.Key_F12), self, self.profiler_overlay.toggle)
+        QShortcut(QKeySequence(Qt.Modifier.SHIFT | Qt.Key.Key_F12), self, self.profiler_overlay.export_trace)
+        self._latency_probe = LatencyProbe('gui')  # Runs only while the overlay is shown
+
         self._timer = QTimer()
         self._timer.timeout.connect(self.update_views)
-        self._timer.start(20)
+        self._timer.start(MIN_FRAME_INTERVAL)
+        self.update_views(override=True)
+
+    def views(self):
+        return (self.orbit_view, self.topo_view, self.skychart_view)
+
+    def _view_visible(self, view):
+        return view.isVisible() and not view.visibleRegion().isEmpty()
+
+    def _tab_visible(self):
+        return self.isVisible() and not self.window().isMinimized()
 
     def update_views(self, override=False):
-        self.time_control_box.update_time()
+        self._force_frame = self._force_frame or override
+        if not self._tab_visible():
+            # Behind another tab or minimised, nothing to draw until showEvent()
+            self._timer.setInterval(IDLE_FRAME_INTERVAL)
+            return
+
+        with PROFILER.stage('time read'):
+            state = self.time_controller.get_state()
+            self.time_control_box.update_time()
+
+        stale_visible = any(self._view_visible(view) for view in self._stale_views)
+        changed = self._force_frame or state.running or state is not self._drawn_state or stale_visible
+        if changed and not self._force_frame and perf_counter() < self._retry_at:
+            changed = False  # The last snapshot was empty (nothing loaded, or it failed), retry at the idle rate
+        if changed:
+            interval = MIN_FRAME_INTERVAL if not state.running else self._frame_cost / FRAME_BUDGET
+            self._timer.setInterval(int(np.clip(interval, MIN_FRAME_INTERVAL, MAX_FRAME_INTERVAL)))
+        else:
+            self._timer.setInterval(IDLE_FRAME_INTERVAL)
+
+        # Only one request in flight, a busy SatController gets the latest time rather than a backlog
+        if changed and not self._snapshot_pending:
+            self._snapshot_pending = True
+            self._force_frame = False
+            self._requested_state = state
+            self._request_started = perf_counter()
+            self.snapshot_requested.emit()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_views(override=True)
+
+    @Slot(float)
+    def on_recompute_progress(self, fraction):
+        self.time_control_box.set_recompute_progress(fraction)
+        if fraction >= 1:
+            self.update_views(override=True)  # Redraw from the new caches even when paused
+
+    @Slot(object)
+    def on_snapshot_ready(self, snapshot):
+        self._snapshot_pending = False
+        if snapshot is None:
+            self._retry_at = perf_counter() + IDLE_FRAME_INTERVAL / 1000
+            self._timer.setInterval(IDLE_FRAME_INTERVAL)
+            return
+        # One snapshot per tick so all three views show the same instant, hidden views catch up once shown
+        self._stale_views = set()
+        for view in self.views():
+            if self._view_visible(view):
+                with PROFILER.stage(f'setData {type(view).__name__}'):
+                    view.animation_update(snapshot)
+            else:
+                self._stale_views.add(view)
+        self._drawn_state = self._requested_state
 
-        if self.time_controller.get_running() or override:
-            self.orbit_view.animation_update()
-            self.topo_view.animation_update()
-            self.skychart_view.animation_update()
\ No newline at end of file
+        now = perf_counter()
+        PROFILER.record('frame (request to drawn)', self._request_started, now)
+        cost = (now - self._request_started) * 1000
+        self._frame_cost = cost if self._frame_cost == 0 else 0.8 * self._frame_cost + 0.2 * cost
\ No newline at end of file
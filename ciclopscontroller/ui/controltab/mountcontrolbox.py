@@ -47,22 +47,43 @@ class MountControlBox(QGroupBox):
         mount_btn_layout.addWidget(self.elevation_spinbox)
 
         mount_layout.addLayout(mount_btn_layout)
+
+        self.tracking_label = QLabel("Not tracking")
+        mount_layout.addWidget(self.tracking_label)
+        self.mount_controller.tracking_status.connect(self.update_tracking_status)
     
     def toggle_mount_tracking(self):
         if self.track_btn.isChecked():
             self.track_btn.setText("Stop Tracking")
-            # Start tracking logic here
+            self.mount_controller.start_tracking()
         else:
             self.track_btn.setText("Start Tracking")
-            # Stop tracking logic here
+            self.mount_controller.stop_tracking()
+            self.tracking_label.setText("Not tracking")
 
     def mount_freeze(self):
-        # Freeze mount logic here
-        pass
+        self.stop_tracking_button()
+        self.mount_controller.abort()
 
     def manual_slew(self):
         azimuth = self.azimuth_spinbox.value()
         elevation = self.elevation_spinbox.value()
-        # Manual slew logic here using azimuth and elevation values
-        pass
+        self.stop_tracking_button()
+        self.mount_controller.slew_to_altaz(azimuth, elevation)
+
+    def stop_tracking_button(self):
+        # Slews and freezes stop tracking in the controller, keep the button in step
+        if self.track_btn.isChecked():
+            self.track_btn.setChecked(False)
+            self.track_btn.setText("Start Tracking")
+            self.tracking_label.setText("Not tracking")
+
+    def update_tracking_status(self, status):
+        if not self.track_btn.isChecked():
+            return
+        self.tracking_label.setText(
+            f"Error az {status.azimuth_error * 3600:+.1f}\" el {status.elevation_error * 3600:+.1f}\"  |  "
+            f"latency {status.latency * 1000:.0f} ms  |  loop {status.interval * 1000:.1f} ms, "
+            f"jitter p99 {status.jitter * 1000:.1f} ms"
+        )
         
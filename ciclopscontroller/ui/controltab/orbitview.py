@@ -2,9 +2,11 @@ import pyqtgraph as pg
 import pyqtgraph.opengl as gl
 from PySide6.QtGui import QVector3D
 
-from ciclopscontroller.controllers.satcontroller import SatController, PositionFrame
+from ciclopscontroller.controllers.satcontroller import SatController, FrameSnapshot
 from ciclopscontroller.controllers.timecontroller import TimeController
+from ciclopscontroller.controllers.profiler import PROFILER
 from ciclopscontroller.ui.glitems.glsphere import GLSphere
+from ciclopscontroller.ui.texturecache import load_texture_levels
 
 import numpy as np
 
@@ -18,7 +20,6 @@ class OrbitView(gl.GLViewWidget):
         self.earth_radius = 6371
 
         self.setup_ui()
-        self.animation_update()
 
     def setup_ui(self):
         self.setCameraPosition(distance=300)
@@ -58,74 +59,31 @@ class OrbitView(gl.GLViewWidget):
         )
         self.addItem(north_marker)
 
-        n_circles = 5
-        n_points = 100
-        self.terminator = []
-        for j in range(n_circles):
-            circle_points = []
-            circle_radius = self.earth_radius * np.cos(j / n_circles * np.pi / 2)
-            for i in range(n_points + 1):
-                angle = 2 * np.pi * i / n_points
-                x = circle_radius * np.cos(angle)
-                y = self.earth_radius * np.sin(j / n_circles * np.pi / 2)
-                z = circle_radius * np.sin(angle)
-                circle_points.append([x, y, z])
-            self.terminator.append(gl.GLLinePlotItem(
-                pos=np.array(circle_points),
-                color=(0.2, 0.2, 0.2, 1),
-                width=2,
-                mode='line_strip',
-            ))
-            self.terminator[-1].setGLOptions('opaque')
-            self.addItem(self.terminator[-1])
-
     def add_earth(self):
-        from PIL import Image
-        earth_image = Image.open("ciclopscontroller/images/earth_texture.jpg")
-        earth_image = earth_image.transpose(Image.Transpose.ROTATE_90).transpose(Image.Transpose.FLIP_LEFT_RIGHT).transpose(Image.Transpose.FLIP_TOP_BOTTOM)
-        earth_array = np.array(earth_image)
-
-        if earth_array.shape[2] == 3:  # RGB image
-            earth_rgba = np.zeros((earth_array.shape[0], earth_array.shape[1], 4), dtype=np.uint8)
-            earth_rgba[..., :3] = earth_array
-            earth_rgba[..., 3] = 255  # Full opacity
-        else:
-            earth_rgba = earth_array
-        self.earth_mesh = GLSphere(earth_rgba)
+        # Mipmap chain prepared once and memory mapped from cache/textures afterwards
+        earth_levels = load_texture_levels("ciclopscontroller/images/earth_texture.jpg")
+        self.earth_mesh = GLSphere(earth_levels, smooth=True)
         self.addItem(self.earth_mesh)
+
+    def texture_level(self):
+        """Coarsest mipmap level that still gives about one texel per pixel across the visible Earth"""
+        camera_distance = max(self.cameraPosition().length(), self.earth_radius * 1.001)
+        half_angle = np.arcsin(self.earth_radius / camera_distance)
+        pixels_across = self.width() * self.devicePixelRatioF() * np.tan(half_angle) / np.tan(np.radians(self.opts['fov']) / 2)
+        texels_across = self.earth_mesh.levels[0].shape[1] / 2  # Half the map faces the camera
+        return int(np.floor(np.log2(max(texels_across / max(pixels_across, 1), 1))))
     
-    def animation_update(self):
-        sat_position = self.sat_controller.get_sat_position(PositionFrame.ITRS)
-        sat_trail_positions = self.sat_controller.get_trail_positions(-30, 60, 100, PositionFrame.ITRS)
-
-        if sat_position is not None:
-            self.sat_marker.setData(pos=np.array(sat_position))
-            sat_pos_qt = QVector3D(*sat_position[0])
-            self.setCameraPosition(pos=sat_pos_qt)
-        if sat_trail_positions is not None:
-            self.sat_trail.setData(pos=np.array(sat_trail_positions))
-
-        self.update_terminator()
-
-    def update_terminator(self):
-        sun_direction = self.sat_controller.get_sun_direction()
-        if sun_direction is None:
-            return
-
-        u_vector = np.array([0, 0, 1])
-        u_vector = u_vector - np.dot(u_vector, sun_direction) * sun_direction
-        u_vector /= np.linalg.norm(u_vector)
-
-        v_vector = np.cross(sun_direction, u_vector)
-        v_vector /= np.linalg.norm(v_vector)
-        
-        for i, circle in enumerate(self.terminator):
-            angles = np.linspace(0, 2 * np.pi, 100)
-            circle_radius = self.earth_radius * np.cos(i / len(self.terminator) * np.pi / 2)
-            circle.setData(pos=
-                           np.cos(angles)[:, None] * u_vector * circle_radius +
-                           np.sin(angles)[:, None] * v_vector * circle_radius +
-                           sun_direction * self.earth_radius * np.sin(i / len(self.terminator) * np.pi / 2)
-                           )
-                
-            
+    def animation_update(self, snapshot: FrameSnapshot):
+        self.sat_marker.setData(pos=snapshot.itrs)
+        sat_pos_qt = QVector3D(*snapshot.itrs[0])
+        self.setCameraPosition(pos=sat_pos_qt)
+        self.sat_trail.setData(pos=snapshot.trail_itrs)
+
+        # Day/night and the terminator are shaded on the GPU from this one vector
+        self.earth_mesh.setSunDirection(snapshot.sun_direction)
+
+    def paintGL(self):
+        with PROFILER.stage('GL paint OrbitView'):
+            # Chosen here rather than per snapshot so zooming or resizing while paused refines it too
+            self.earth_mesh.setLevel(self.texture_level())
+            super().paintGL()
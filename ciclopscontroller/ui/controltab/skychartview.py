@@ -3,7 +3,8 @@ import pyqtgraph.opengl as gl
 
 import numpy as np
 
-from ciclopscontroller.controllers.satcontroller import PositionFrame
+from ciclopscontroller.controllers.satcontroller import FrameSnapshot
+from ciclopscontroller.controllers.profiler import PROFILER
 
 class SkyChartView(pg.PlotWidget):
     def __init__(self, sat_controller, time_controller):
@@ -13,7 +14,6 @@ class SkyChartView(pg.PlotWidget):
         self.time_controller = time_controller
 
         self.setup_ui()
-        self.animation_update()
 
     def setup_ui(self):
         # self.setBackground('k')
@@ -72,15 +72,10 @@ class SkyChartView(pg.PlotWidget):
         )
         self.addItem(self.sat_trail)
 
-    def animation_update(self):
-        sat_position = self.sat_controller.get_sat_position(PositionFrame.ALTAZ)
-        sat_trail_positions = self.sat_controller.get_trail_positions(-30, 60, 100, PositionFrame.ALTAZ) # Alt, Az
-
-        if sat_position is not None:
-            self.sat_marker.setData(pos=self.altaz_to_skychart(sat_position))
-        if sat_trail_positions is not None:
-            skychart_trail = self.altaz_to_skychart(sat_trail_positions)
-            self.sat_trail.setData(x=skychart_trail[:, 0], y=skychart_trail[:, 1])
+    def animation_update(self, snapshot: FrameSnapshot):
+        self.sat_marker.setData(pos=self.altaz_to_skychart(snapshot.altaz))
+        skychart_trail = self.altaz_to_skychart(snapshot.trail_altaz) # Alt, Az
+        self.sat_trail.setData(x=skychart_trail[:, 0], y=skychart_trail[:, 1])
 
     def altaz_to_skychart(self, altaz):
         if altaz.ndim == 1:
@@ -89,3 +84,7 @@ class SkyChartView(pg.PlotWidget):
         east = - radius * np.sin(altaz[:, 1])
         north = radius * np.cos(altaz[:, 1])
         return np.array([east, north]).T
+
+    def paintEvent(self, event):
+        with PROFILER.stage('paint SkyChartView'):
+            super().paintEvent(event)
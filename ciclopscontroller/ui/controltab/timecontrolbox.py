@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QGroupBox, QVBoxLayout, QLabel, QSlider, QPushButton, QHBoxLayout
+from PySide6.QtWidgets import QGroupBox, QVBoxLayout, QLabel, QSlider, QPushButton, QHBoxLayout, QProgressBar
 from PySide6.QtCore import Qt
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
@@ -44,6 +44,12 @@ class TimeControlBox(QGroupBox):
         time_slider_layout.addWidget(QLabel("+20m"))
         time_layout.addLayout(time_slider_layout)
 
+        self.recompute_bar = QProgressBar()
+        self.recompute_bar.setRange(0, 100)
+        self.recompute_bar.setFormat("Recomputing ephemeris for new epoch: %p%")
+        self.recompute_bar.hide()
+        time_layout.addWidget(self.recompute_bar)
+
         playback_layout = QHBoxLayout()
         self.playback_btn = QPushButton("Play")
         self.playback_btn.setCheckable(True)
@@ -83,7 +89,11 @@ class TimeControlBox(QGroupBox):
     def update_time(self):
         datetime_ = self.time_controller.get_datetime()
         self.update_time_label(datetime_)
-        self.update_time_slider(self.time_controller._time_since_epoch)
+        self.update_time_slider(self.time_controller.get_time_since_epoch())
+
+    def set_recompute_progress(self, fraction: float):
+        self.recompute_bar.setValue(round(fraction * 100))
+        self.recompute_bar.setVisible(fraction < 1)
 
     def on_time_slider_changed(self, value):
         self.force_update()
@@ -1,8 +1,9 @@
 import pyqtgraph as pg
 import pyqtgraph.opengl as gl
 
-from ciclopscontroller.controllers.satcontroller import SatController, PositionFrame
+from ciclopscontroller.controllers.satcontroller import SatController, FrameSnapshot
 from ciclopscontroller.controllers.timecontroller import TimeController
+from ciclopscontroller.controllers.profiler import PROFILER
 
 import numpy as np
 
@@ -13,7 +14,6 @@ class TopoView(gl.GLViewWidget):
         self.sat_controller = sat_controller
         self.time_controller = time_controller
         self.setup_ui()
-        self.animation_update()
 
     def setup_ui(self):
         self.setCameraPosition(distance=1000)
@@ -52,10 +52,10 @@ class TopoView(gl.GLViewWidget):
         )
         self.addItem(north_marker)
 
-    def animation_update(self):
-        sat_position = self.sat_controller.get_sat_position(PositionFrame.TOPO)
-        sat_trail_positions = self.sat_controller.get_trail_positions(-30, 60, 100, PositionFrame.TOPO)
-        if sat_position is not None:
-            self.sat_marker.setData(pos=np.array(sat_position))
-        if sat_trail_positions is not None:
-            self.sat_trail.setData(pos=np.array(sat_trail_positions))
\ No newline at end of file
+    def animation_update(self, snapshot: FrameSnapshot):
+        self.sat_marker.setData(pos=snapshot.topo)
+        self.sat_trail.setData(pos=snapshot.trail_topo)
+
+    def paintGL(self):
+        with PROFILER.stage('GL paint TopoView'):
+            super().paintGL()
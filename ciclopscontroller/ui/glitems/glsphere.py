@@ -3,77 +3,124 @@ from OpenGL.GL import (GL_TEXTURE_2D, GL_RGBA, GL_UNSIGNED_BYTE,
                       GL_LINEAR, GL_NEAREST, GL_CLAMP_TO_BORDER, GL_PROXY_TEXTURE_2D,
                       glTexImage2D, glGetTexLevelParameteriv, GL_TEXTURE_WIDTH,
                       GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER, GL_TEXTURE_WRAP_S,
-                      GL_TEXTURE_WRAP_T, glColor4f, glBegin, glEnd,
-                      glVertex3f, glTexCoord2f, glDisable, GL_TRIANGLES, GL_DEPTH_TEST)
+                      GL_TEXTURE_WRAP_T, GL_TEXTURE_MAX_LEVEL, GL_LINEAR_MIPMAP_LINEAR,
+                      GL_NEAREST_MIPMAP_LINEAR, GL_TEXTURE0,
+                      glDisable, GL_TRIANGLES, GL_DEPTH_TEST, GL_FLOAT, GL_UNSIGNED_INT,
+                      GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW,
+                      glGenBuffers, glBindBuffer, glBufferData, glDrawElements, glActiveTexture,
+                      glGetAttribLocation, glGetUniformLocation, glVertexAttribPointer,
+                      glEnableVertexAttribArray, glDisableVertexAttribArray, glUniformMatrix4fv,
+                      glUniform1i, glUniform1f, glUniform3f)
+import ctypes
 import numpy as np
 from pyqtgraph.opengl.GLGraphicsItem import GLGraphicsItem
+from pyqtgraph.opengl.shaders import ShaderProgram, VertexShader, FragmentShader
+
+# Day/night shading from a single sun direction uniform, positions are in the sphere's own frame so the
+# surface normal is just the normalised position
+DAY_NIGHT_SHADER = ShaderProgram('glsphereDayNight', [
+    VertexShader("""
+        uniform mat4 u_mvp;
+        attribute vec4 a_position;
+        attribute vec2 a_texcoord;
+        varying vec2 v_texcoord;
+        varying vec3 v_normal;
+        void main() {
+            v_texcoord = a_texcoord;
+            v_normal = a_position.xyz;
+            gl_Position = u_mvp * a_position;
+        }
+    """),
+    FragmentShader("""
+        #ifdef GL_ES
+        precision mediump float;
+        #endif
+        uniform sampler2D u_texture;
+        uniform vec3 u_sun;
+        uniform float u_shading;
+        uniform float u_night_brightness;
+        uniform vec3 u_day_tint;
+        uniform float u_twilight;
+        uniform float u_terminator_width;
+        varying vec2 v_texcoord;
+        varying vec3 v_normal;
+        void main() {
+            vec4 color = texture2D(u_texture, v_texcoord);
+            float cos_sun = dot(normalize(v_normal), u_sun);
+            float day = smoothstep(-u_twilight, u_twilight, cos_sun);
+            float brightness = mix(1.0, mix(u_night_brightness, 1.0, day), u_shading);
+            color.rgb = color.rgb * brightness + u_day_tint * day * u_shading;
+            if (u_shading > 0.0 && abs(cos_sun) < u_terminator_width) {
+                color.rgb = mix(color.rgb, vec3(0.6, 0.6, 0.6), 0.5);
+            }
+            gl_FragColor = color;
+        }
+    """),
+])
 
 
 class GLSphere(GLGraphicsItem):
-    def __init__(self, data, r=6371, smooth=False, resolution=(16, 32), glOptions="opaque", parentItem=None):
+    def __init__(self, data, r=6371, smooth=False, resolution=(64, 128), glOptions="opaque", parentItem=None):
         """
         ==============  =======================================================================================
         **Arguments:**
-        data            Volume data to be rendered. *Must* be 3D numpy array (x, y, RGBA) with dtype=ubyte.
+        data            Texture, either a 3D numpy array (x, y, RGBA) with dtype=ubyte or a mipmap chain from
+                        texturecache.load_texture_levels(), a list of (height, width, RGBA) arrays
         r               Radius of the sphere
         smooth          (bool) If True, the volume slices are rendered with linear interpolation
         resolution      Tuple (theta_divs, phi_divs) controlling sphere mesh resolution
         ==============  =======================================================================================
+
+        The mesh lives in a vertex and an index buffer on the GPU and is drawn with one glDrawElements call,
+        so the resolution costs GPU time only and meshes of 256x512 are fine.
+
+        A mipmap chain is uploaded from setLevel()'s level down, so a distant view can drop the full
+        resolution levels from GPU memory and minified texels are filtered instead of aliasing.
+
+        setSunDirection() shades the night side in the fragment shader, moving the terminator costs one
+        uniform per frame.
         """
         self.r = r
         self.smooth = smooth
         self.resolution = resolution  # (theta divisions, phi divisions)
         self._needUpdate = False
+        self.level = 0
+        self.sun_direction = None
+        self.night_brightness = 1.0    # Texture scale on the night side, the default map is already a night map
+        self.day_tint = (0.16, 0.2, 0.28)  # Added on the day side so it stands out from the city lights
+        self.twilight = 0.05           # Half width of the day/night blend, in cos(sun angle)
+        self.terminator_width = 0.004  # Half width of the terminator line in cos(sun angle), 0 hides it
         super().__init__(parentItem=parentItem)
         self.setData(data)
         self.setGLOptions(glOptions)
         self.texture = None
+        self.vertex_buffer = None
+        self.index_buffer = None
         
         # Pre-compute sphere vertices and texture coordinates
         self._precompute_sphere_mesh()
 
     def _precompute_sphere_mesh(self):
-        """Pre-compute the sphere mesh to avoid recalculations during rendering"""
+        """Pre-compute the sphere mesh as interleaved [x, y, z, u, v] vertices and triangle indices"""
         theta_divs, phi_divs = self.resolution
         theta = np.linspace(0, np.pi, theta_divs, dtype="float32")
         phi = np.linspace(0, 2 * np.pi, phi_divs, dtype="float32")
-        t_n = theta / np.pi
-        p_n = phi / (2 * np.pi)
-        
-        # Create arrays to store coordinates
-        self.vertices = []
-        self.texcoords = []
-        
-        for j in range(len(theta) - 1):
-            for i in range(len(phi) - 1):
-                # Compute texture coordinates for the quad corners
-                tex_nw = (p_n[i], t_n[j])
-                tex_sw = (p_n[i], t_n[j + 1])
-                tex_se = (p_n[i + 1], t_n[j + 1])
-                tex_ne = (p_n[i + 1], t_n[j])
-                
-                # Compute vertex coordinates for the quad corners
-                xyz_nw = self.to_xyz(phi[i], theta[j])
-                xyz_sw = self.to_xyz(phi[i], theta[j + 1])
-                xyz_se = self.to_xyz(phi[i + 1], theta[j + 1])
-                xyz_ne = self.to_xyz(phi[i + 1], theta[j])
-                
-                # Store quad vertices and texture coordinates (as two triangles)
-                # First triangle (nw, sw, se)
-                self.vertices.append(xyz_nw)
-                self.vertices.append(xyz_sw)
-                self.vertices.append(xyz_se)
-                self.texcoords.append(tex_nw)
-                self.texcoords.append(tex_sw)
-                self.texcoords.append(tex_se)
-                
-                # Second triangle (nw, se, ne)
-                self.vertices.append(xyz_nw)
-                self.vertices.append(xyz_se)
-                self.vertices.append(xyz_ne)
-                self.texcoords.append(tex_nw)
-                self.texcoords.append(tex_se)
-                self.texcoords.append(tex_ne)
+        phi_grid, theta_grid = np.meshgrid(phi, theta)  # (theta_divs, phi_divs), row j is theta[j]
+
+        # Vertices are shared between neighbouring quads, the seam column is duplicated for the texture wrap
+        self.vertices = np.empty((theta_divs * phi_divs, 5), dtype="float32")
+        self.vertices[:, :3] = np.stack(self.to_xyz(phi_grid, theta_grid), axis=-1).reshape(-1, 3)
+        self.vertices[:, 3] = (phi_grid / (2 * np.pi)).ravel()
+        self.vertices[:, 4] = (theta_grid / np.pi).ravel()
+
+        # Two triangles per quad, (nw, sw, se) and (nw, se, ne)
+        rows, cols = np.meshgrid(np.arange(theta_divs - 1), np.arange(phi_divs - 1), indexing='ij')
+        nw = (rows * phi_divs + cols).ravel()
+        ne = nw + 1
+        sw = nw + phi_divs
+        se = sw + 1
+        self.indices = np.stack([nw, sw, se, nw, se, ne], axis=-1).astype("uint32").ravel()
+        self._meshNeedUpload = True
 
     def initializeGL(self):
         if self.texture is not None:
@@ -83,6 +130,30 @@ class GLSphere(GLGraphicsItem):
 
     def setData(self, data):
         self.data = data
+        if isinstance(data, (list, tuple)):
+            self.levels = list(data)
+        else:
+            # Single (x, y, RGBA) image, store it the way glTexImage2D reads it
+            self.levels = [np.ascontiguousarray(data.transpose((1, 0, 2)))]
+        self.level = min(self.level, len(self.levels) - 1)
+        self._needUpdate = True
+        self.update()
+
+    def setSunDirection(self, sun_direction):
+        """Unit vector towards the Sun in the sphere's frame, or None for uniform lighting"""
+        self.sun_direction = None if sun_direction is None else np.asarray(sun_direction, dtype="float32")
+        self.update()
+
+    def setTerminatorWidth(self, width):
+        self.terminator_width = width
+        self.update()
+
+    def setLevel(self, level):
+        """Use mipmap ``level`` (0 is full resolution) as the most detailed level on the GPU"""
+        level = int(np.clip(level, 0, len(self.levels) - 1))
+        if level == self.level:
+            return
+        self.level = level
         self._needUpdate = True
         self.update()
         
@@ -92,34 +163,48 @@ class GLSphere(GLGraphicsItem):
         self._precompute_sphere_mesh()
         self.update()
 
+    def _uploadMesh(self):
+        if self.vertex_buffer is None:
+            self.vertex_buffer, self.index_buffer = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
     def _updateTexture(self):
         glBindTexture(GL_TEXTURE_2D, self.texture)
+        levels = self.levels[self.level:]
+        mipmapped = len(levels) > 1
         if self.smooth:
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR if mipmapped else GL_LINEAR)
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
         else:
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST_MIPMAP_LINEAR if mipmapped else GL_NEAREST)
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_BORDER)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_BORDER)
-        shape = self.data.shape
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+        height, width = levels[0].shape[:2]
 
         ## Test texture dimensions first
         glTexImage2D(
-            GL_PROXY_TEXTURE_2D, 0, GL_RGBA, shape[0], shape[1], 0, 
+            GL_PROXY_TEXTURE_2D, 0, GL_RGBA, width, height, 0, 
             GL_RGBA, GL_UNSIGNED_BYTE, None
         )
         if glGetTexLevelParameteriv(GL_PROXY_TEXTURE_2D, 0, GL_TEXTURE_WIDTH) == 0:
             raise Exception(
                 "OpenGL failed to create 2D texture (%dx%d); too large for this hardware."
-                % shape[:2]
+                % (width, height)
             )
 
-        data = np.ascontiguousarray(self.data.transpose((1, 0, 2)))
-        glTexImage2D(
-            GL_TEXTURE_2D, 0, GL_RGBA, shape[0], shape[1], 0, 
-            GL_RGBA, GL_UNSIGNED_BYTE, data
-        )
+        # Levels are already contiguous and bottom-up, memory-mapped ones are read straight from the page cache
+        for index, level in enumerate(levels):
+            glTexImage2D(
+                GL_TEXTURE_2D, index, GL_RGBA, level.shape[1], level.shape[0], 0, 
+                GL_RGBA, GL_UNSIGNED_BYTE, level
+            )
         glDisable(GL_TEXTURE_2D)
 
     def setupGLState(self):
@@ -132,22 +217,47 @@ class GLSphere(GLGraphicsItem):
         if self._needUpdate:
             self._updateTexture()
             self._needUpdate = False
+        if self._meshNeedUpload:
+            self._uploadMesh()
+            self._meshNeedUpload = False
             
-        glEnable(GL_TEXTURE_2D)
+        glActiveTexture(GL_TEXTURE0)
         glBindTexture(GL_TEXTURE_2D, self.texture)
         
         self.setupGLState()
         
-        glColor4f(1, 1, 1, 1)
-        
-        # Render using triangles for better performance
-        glBegin(GL_TRIANGLES)
-        for i in range(len(self.vertices)):
-            glTexCoord2f(*self.texcoords[i])
-            glVertex3f(*self.vertices[i])
-        glEnd()
+        program = DAY_NIGHT_SHADER.program()
+        mvp = np.array(self.mvpMatrix().data(), dtype="float32")
+        position_loc = glGetAttribLocation(program, "a_position")
+        texcoord_loc = glGetAttribLocation(program, "a_texcoord")
+
+        # Whole sphere in a single indexed draw from the buffers uploaded in _uploadMesh()
+        stride = self.vertices.strides[0]
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+        glVertexAttribPointer(position_loc, 3, GL_FLOAT, False, stride, ctypes.c_void_p(0))
+        glVertexAttribPointer(texcoord_loc, 2, GL_FLOAT, False, stride, ctypes.c_void_p(3 * self.vertices.itemsize))
+        glEnableVertexAttribArray(position_loc)
+        glEnableVertexAttribArray(texcoord_loc)
+        try:
+            with DAY_NIGHT_SHADER:
+                glUniformMatrix4fv(glGetUniformLocation(program, "u_mvp"), 1, False, mvp)
+                glUniform1i(glGetUniformLocation(program, "u_texture"), 0)
+                sun = self.sun_direction if self.sun_direction is not None else np.zeros(3)
+                glUniform3f(glGetUniformLocation(program, "u_sun"), *sun)
+                glUniform1f(glGetUniformLocation(program, "u_shading"), 0.0 if self.sun_direction is None else 1.0)
+                glUniform1f(glGetUniformLocation(program, "u_night_brightness"), self.night_brightness)
+                glUniform3f(glGetUniformLocation(program, "u_day_tint"), *self.day_tint)
+                glUniform1f(glGetUniformLocation(program, "u_twilight"), self.twilight)
+                glUniform1f(glGetUniformLocation(program, "u_terminator_width"), self.terminator_width)
+                glDrawElements(GL_TRIANGLES, len(self.indices), GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        finally:
+            glDisableVertexAttribArray(position_loc)
+            glDisableVertexAttribArray(texcoord_loc)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
         
-        glDisable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, 0)
 
     def to_xyz(self, phi, theta):
         theta = theta + np.pi
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFontDatabase
+
+from ciclopscontroller.controllers.profiler import PROFILER
+
+
+class ProfilerOverlay(QLabel):
+    def __init__(self, parent, trace_directory='cache/traces'):
+        """
+        Floating table of rolling p50/p99 stage times drawn over ``parent``. Showing it turns the shared
+        profiler on, hiding it turns it off again so the instrumentation costs nothing while unused.
+        """
+        super().__init__(parent)
+        self.trace_directory = trace_directory
+        self.message = ""
+
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 180); color: white; padding: 6px;")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.hide()
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+
+    def toggle(self):
+        if self.isVisible():
+            self._timer.stop()
+            PROFILER.enabled = False
+            for probe in PROFILER.probes:
+                probe.stop_requested.emit()  # Queued to each probe's own thread
+            self.hide()
+        else:
+            PROFILER.clear()
+            PROFILER.enabled = True
+            for probe in PROFILER.probes:
+                probe.start_requested.emit()
+            self.refresh()
+            self.show()
+            self.raise_()
+            self._timer.start(500)
+
+    def export_trace(self):
+        filename = f"{self.trace_directory}/trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        PROFILER.export_chrome_trace(filename)
+        self.message = f"Trace written to {filename}"
+        self.refresh()
+        return filename
+
+    def refresh(self):
+        lines = [f"{'stage':<34}{'n':>6}{'p50 ms':>9}{'p99 ms':>9}"]
+        for name, (count, p50, p99) in sorted(PROFILER.summary().items()):
+            lines.append(f"{name:<34}{count:>6}{p50:>9.2f}{p99:>9.2f}")
+        lines.append("F12 hide, Shift+F12 export Chrome trace")
+        if self.message:
+            lines.append(self.message)
+        self.setText("\n".join(lines))
+        self.adjustSize()
@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+
+from ciclopscontroller.ephemeris.diskcache import DiskCache
+
+
+def load_texture_levels(filename, disk_cache=None):
+    """
+    Return the mipmap chain of the image ``filename`` as a list of (height, width, RGBA) uint8 arrays, full
+    resolution first and halving down to 1x1. Rows are stored bottom up, ready for glTexImage2D.
+
+    The chain is built once and kept in ``disk_cache`` (``cache/textures`` by default) keyed on the file's
+    size and modification time, later calls only memory map it so PIL is not even imported.
+    """
+    disk_cache = disk_cache or DiskCache('cache/textures')
+    stat = os.stat(filename)
+    key = DiskCache.make_key(kind='texture', filename=os.path.abspath(filename), size=stat.st_size, mtime=stat.st_mtime_ns)
+    arrays = disk_cache.load(key)
+    if arrays is None:
+        arrays = {f'level_{index:02d}': level for index, level in enumerate(_build_levels(filename))}
+        disk_cache.save(key, arrays)
+    return [arrays[name] for name in sorted(arrays)]
+
+
+def _build_levels(filename):
+    from PIL import Image
+    image = Image.open(filename).convert('RGBA')
+    # OpenGL expects the first row at the bottom of the image
+    level = np.ascontiguousarray(np.asarray(image)[::-1])
+
+    levels = [level]
+    while level.shape[0] > 1 or level.shape[1] > 1:
+        # 2x2 box filter, an odd trailing row or column is dropped so sizes halve like GL's floor(n / 2)
+        height, width = max(1, level.shape[0] // 2), max(1, level.shape[1] // 2)
+        rows = 2 if level.shape[0] > 1 else 1
+        cols = 2 if level.shape[1] > 1 else 1
+        blocks = level[:height * rows, :width * cols].reshape(height, rows, width, cols, 4)
+        level = np.ascontiguousarray(blocks.mean(axis=(1, 3)).round().astype(np.uint8))
+        levels.append(level)
+    return levels
@@ -66,8 +66,19 @@ class SatelliteOrbitVisualizerGL(QMainWindow):
         
         # Load ephemeris for astronomical calculations
         self.ts = sf.load.timescale()
-        self.earth = sf.load('de421.bsp')['earth']
-        self.sun = sf.load('de421.bsp')['sun']
+        eph = sf.load('de421.bsp')
+        self.earth = eph['earth']
+        self.sun = eph['sun']
+
+        # London is fixed in ITRS, so its position and ENU rotation are computed once
+        self.london_itrs_pos = sf.wgs84.latlon(self.london_lat, self.london_lon).itrs_xyz.km
+        lat = np.radians(self.london_lat)
+        lon = np.radians(self.london_lon)
+        self.london_rotation = np.array([
+            [-np.sin(lon), np.cos(lon), 0],
+            [-np.sin(lat)*np.cos(lon), -np.sin(lat)*np.sin(lon), np.cos(lat)],
+            [np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)]
+        ])
         
         # Setup UI
         self.setup_ui()
@@ -372,64 +383,28 @@ class SatelliteOrbitVisualizerGL(QMainWindow):
     
     def teme_to_topographic(self, teme_position):
         """
-        Convert a position vector from TEME reference frame to a topographic frame centered at London.
+        Convert position vectors from TEME reference frame to a topographic frame centered at London.
         
         Args:
-            teme_position (np.ndarray): Position vector [x, y, z] in TEME frame (km)
+            teme_position (np.ndarray): Position vector [x, y, z] or (N, 3) array in TEME frame (km)
             
         Returns:
-            np.ndarray: Position vector [east, north, up] in the topographic frame (km)
+            np.ndarray: Position vector(s) [east, north, up] in the topographic frame (km)
         """
-        # Get the current time in Skyfield format
-        t = self.ts.utc(self.current_time.year, self.current_time.month, self.current_time.day,
-                    self.current_time.hour, self.current_time.minute, self.current_time.second + self.current_time.microsecond / 1000000.0)
-        
-        # Create a Skyfield Topos object for London's location
-        london = sf.wgs84.latlon(self.london_lat, self.london_lon)
-        
-        # Get London's position in the ITRS frame
-        london_geocentric = london.at(t)
-        london_itrs_pos = london_geocentric.itrf_xyz().km
-        
-        # Calculate the relative position vector (satellite position relative to London)
-        rel_position = teme_position - london_itrs_pos
-        
-        # Convert to topographic frame
-        # The ITRS frame has Z pointing along Earth's rotation axis, X pointing to the 
-        # Greenwich meridian, and Y completing the right-handed system
-        
-        # Get London's latitude and longitude in radians
-        lat = np.radians(self.london_lat)
-        lon = np.radians(self.london_lon)
-        
-        # Rotation matrix from ITRS to [East, North, Up]
-        sin_lon = np.sin(lon)
-        cos_lon = np.cos(lon)
-        sin_lat = np.sin(lat)
-        cos_lat = np.cos(lat)
-        
-        rotation = np.array([
-            [-sin_lon, cos_lon, 0],
-            [-sin_lat*cos_lon, -sin_lat*sin_lon, cos_lat],
-            [cos_lat*cos_lon, cos_lat*sin_lon, sin_lat]
-        ])
-        
-        # Apply rotation to get the position in the topographic frame
-        topo_position = rotation @ rel_position
-        
-        return topo_position  # Returns [east, north, up]
+        # Relative position to London rotated into [East, North, Up], works on one or many vectors
+        return (np.asarray(teme_position) - self.london_itrs_pos) @ self.london_rotation.T
 
     def topo_to_azel(self, topo_position):
         """
         Convert a topographic position vector to azimuth and elevation angles.
         
         Args:
-            topo_position (np.ndarray): Position vector [east, north, up] in the topographic frame (km)
+            topo_position (np.ndarray): Position vector [east, north, up] or (N, 3) array in the topographic frame (km)
             
         Returns:
             tuple: (azimuth, elevation) in radians
         """
-        east, north, up = topo_position
+        east, north, up = np.moveaxis(np.asarray(topo_position), -1, 0)
         
         # Calculate horizontal distance
         horizontal_distance = np.sqrt(east**2 + north**2)
@@ -595,7 +570,7 @@ class SatelliteOrbitVisualizerGL(QMainWindow):
         topo_start = self.current_time - timedelta(minutes=5)
         topo_end = self.current_time + timedelta(minutes=5)
         topo_positions = self.compute_satellite_positions(satellite, topo_start, topo_end, points=100, use_itrs=True)
-        topo_positions = [self.teme_to_topographic(pos) for pos in topo_positions]
+        topo_positions = self.teme_to_topographic(topo_positions)
         
         if self.topo_trail is None:
             self.topo_trail = gl.GLLinePlotItem(pos=topo_positions, color=(0, 1, 0, 1), width=2)
@@ -603,8 +578,7 @@ class SatelliteOrbitVisualizerGL(QMainWindow):
         else:
             self.topo_trail.setData(pos=topo_positions)
 
-        sky_positions = [self.topo_to_azel(pos) for pos in topo_positions]
-        sky_positions = [self.azel_to_sky(azimuth, elevation) for azimuth, elevation in sky_positions]
+        sky_positions = np.array(self.azel_to_sky(*self.topo_to_azel(topo_positions))).T
         
         if self.sky_trail is None:
             self.sky_trail = pg.PlotCurveItem(
@@ -724,24 +698,17 @@ class SatelliteOrbitVisualizerGL(QMainWindow):
     def compute_satellite_positions(self, satellite, start_time, end_time, points=100, use_itrs=False):
         """Compute satellite positions over a time range"""
         time_range = np.linspace(0, (end_time - start_time).total_seconds(), points)
-        positions = []
+        # One skyfield time array for the whole range instead of one Time per point
+        t_sf = self.ts.utc(start_time.year, start_time.month, start_time.day,
+                           start_time.hour, start_time.minute,
+                           start_time.second + start_time.microsecond / 1000000.0 + time_range)
         
-        for t in time_range:
-            time = start_time + timedelta(seconds=t)
-            t_sf = self.ts.utc(time.year, time.month, time.day, 
-                          time.hour, time.minute, time.second)
-            
-            if use_itrs:
-                # Get position in ITRS (Earth-fixed) frame
-                pos = self.teme_to_itrs(satellite, t_sf)
-            else:
-                # Get position in original frame (TEME)
-                pos = satellite.at(t_sf).position.km
-                
-            positions.append(pos)
-            
-        return np.array(positions)
-    
+        if use_itrs:
+            # Get positions in ITRS (Earth-fixed) frame
+            return np.array(self.teme_to_itrs(satellite, t_sf)).T
+        # Get positions in original frame (TEME)
+        return np.array(satellite.at(t_sf).position.km).T
+
     def load_tle_data(self):
         """Load satellite TLE data from a file"""
         # file_name, _ = QFileDialog.getOpenFileName(self, "Open TLE File", "", "Text Files (*.txt);;All Files (*)")
@@ -873,12 +840,12 @@ class SatelliteOrbitVisualizerGL(QMainWindow):
                 sat_name = self.sat_combo.currentText()
                 satellite = self.satellites[sat_name]
                 itrs_positions = self.compute_satellite_positions(satellite, self.current_time, self.current_time + timedelta(minutes=10), points=10000, use_itrs=True)
-                topo_positions = np.array([self.teme_to_topographic(pos) for pos in itrs_positions])
+                topo_positions = self.teme_to_topographic(itrs_positions)
                 timedeltas = np.linspace(0, timedelta(minutes=10).total_seconds(), 10000)
                 times = np.array([self.current_time + timedelta(seconds=t) for t in timedeltas])
                 # print(times.shape, topo_positions.shape)
 
-                azel_values = np.array([self.topo_to_azel(pos) for pos in topo_positions])
+                azel_values = np.array(self.topo_to_azel(topo_positions)).T
                 az_values = azel_values[:, 0]  # First column is azimuth
                 el_values = azel_values[:, 1]  # Second column is elevation
                 